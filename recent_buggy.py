@@ -5,9 +5,24 @@ import math
 import sys
 import os
 import json
+import zlib
+import threading
+import time
+import copy
+import weakref
+import mmap
+import struct
+from bisect import bisect_right
+from itertools import accumulate
+from collections import OrderedDict, deque, namedtuple
 from datetime import datetime
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Инициализация Pygame
 pygame.init()
 pygame.mixer.init()
@@ -19,6 +34,29 @@ ROAD_WIDTH = 400
 PLAYER_SPEED = 5
 MAX_ENEMY_SPEED = 7
 MIN_ENEMY_SPEED = 3
+CRT_CACHE_DIR = "crt_cache"
+FONT_DIR = "fonts"
+TEXT_CACHE_SIZE = 256
+CRT_CACHE_BUDGET = 128 * 1024 * 1024
+CRT_CACHE_FILES = 8
+CRT_COMPACT = False
+CRT_COMPACT_SCALE = 8
+RESIZE_DEBOUNCE_MS = 150
+SPRITE_CACHE_SIZE = 2048
+SPRITE_ALPHA_STEP = 8
+SKID_MARK_FADE = 245
+ENEMY_POOL_SIZE = 32
+ROAD_CURVE_EPSILON = 0.5
+ROTATION_CACHE_SIZE = 1024
+MENU_IDLE_TIMEOUT_MS = 1000
+CRT_READY_EVENT = pygame.USEREVENT + 1
+TRACK_MAGIC = b"RTRK"
+TRACK_VERSION = 1
+TRACK_INDEX_STRIDE = 256
+TRACK_WINDOW_BLOCKS = 4
+INSANE_TINT = (1.0, 0.75, 0.75)
+COLOR_KEY = (255, 0, 255)
+DEBUG_KEYS = {pygame.K_F3: None, pygame.K_F5: "bloom", pygame.K_F6: "aberration", pygame.K_F7: "crt", pygame.K_F8: None, pygame.K_F9: None}
 
 # Цвета в ретро-стиле
 BLACK = (0, 0, 0)
@@ -114,17 +152,299 @@ class Leaderboard:
         entries = self.get_entries(car_filter)
         return entries[:count]
 
+class FontRegistry:
+    # Fonts are resolved once per (family, size, bold); a bundled file in FONT_DIR avoids the system font scan
+    def __init__(self, font_dir=FONT_DIR):
+        self.font_dir = font_dir
+        self.fonts = {}
+
+    def get(self, family, size, bold=False):
+        key = (family.lower(), size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.load(*key)
+            self.fonts[key] = font
+        return font
+
+    def load(self, family, size, bold):
+        candidates = [f"{family}-bold.ttf", f"{family}.ttf"] if bold else [f"{family}.ttf"]
+        for name in candidates:
+            path = os.path.join(self.font_dir, name)
+            if os.path.exists(path):
+                font = pygame.font.Font(path, size)
+                # Only the regular face is bundled, so embolden it
+                if bold and name == f"{family}.ttf":
+                    font.set_bold(True)
+                return font
+        return pygame.font.SysFont(family, size, bold=bold)
+
+FONTS = FontRegistry()
+
+class TextCache:
+    # Labels that don't change between frames are rendered once and then only blitted
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        key = (font, text, antialias, tuple(color), background and tuple(background))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+TEXT_CACHE = TextCache()
+
+class BitmapFont:
+    # Glyphs of one font and color rasterized once into an atlas; a string is then one blits call
+    CHARSET = "".join(chr(code) for code in range(32, 127))
+
+    def __init__(self, font, color, charset=CHARSET):
+        self.font = font
+        self.color = color
+        glyphs = [(char, font.render(char, True, color)) for char in charset]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        self.atlas = pygame.Surface((width, font.get_height()), pygame.SRCALPHA)
+        self.glyphs = {}
+        self.advances = {}
+        x = 0
+        for char, glyph in glyphs:
+            self.atlas.blit(glyph, (x, 0))
+            self.glyphs[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert_alpha()
+
+    def advance(self, char, next_char):
+        # Measured per pair so kerning matches what font.render would produce
+        pair = char + next_char
+        advance = self.advances.get(pair)
+        if advance is None:
+            advance = self.font.size(pair)[0] - self.font.size(next_char)[0]
+            self.advances[pair] = advance
+        return advance
+
+    def draw(self, target, text, pos):
+        if any(char not in self.glyphs for char in text):
+            # Outside the atlas, fall back to regular rendering
+            target.blit(TEXT_CACHE.render(self.font, text, True, self.color), pos)
+            return
+        x, y = pos
+        sequence = []
+        for i, char in enumerate(text):
+            sequence.append((self.atlas, (x, y), self.glyphs[char]))
+            if i + 1 < len(text):
+                x += self.advance(char, text[i + 1])
+        target.blits(sequence, doreturn=False)
+
+class GraphicsConfig:
+    DEFAULTS = {
+        "postfx": {"bloom": False, "aberration": False, "crt": True},
+        "retro_resolution": False,
+        "retro_size": [INITIAL_WIDTH, INITIAL_HEIGHT],
+        "retro_integer_scale": True,
+        "retro_crt_on_display": False,
+        "palette_mode": False,
+        "quality_governor": True,
+        "skid_marks": False,
+        "rotation_step": 1,
+        "bitmap_counters": False,
+        "race_track": None,
+    }
+
+    def __init__(self, filename="graphics.json"):
+        self.filename = filename
+        self.data = copy.deepcopy(self.DEFAULTS)
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Keep defaults for anything missing so older files stay valid
+        for key, default in self.DEFAULTS.items():
+            value = data.get(key)
+            if isinstance(default, dict) and isinstance(value, dict):
+                self.data[key].update(value)
+            elif value is not None and not isinstance(default, dict):
+                self.data[key] = value
+
+    def save(self):
+        try:
+            with open(self.filename, 'w') as f:
+                json.dump(self.data, f, indent=2)
+        except OSError:
+            pass
+
+    def get(self, key):
+        return self.data[key]
+
+    def set(self, key, value):
+        self.data[key] = value
+        self.save()
+
 class CRT:
-    def __init__(self, screen):
+    CACHE_VERSION = 3
+
+    def __init__(self, screen, size=None, compact=CRT_COMPACT, cache_dir=CRT_CACHE_DIR, cache_budget=CRT_CACHE_BUDGET):
         self.screen = screen
-        self.scanlines = None
-        self.vignette = None
-        self.update_effects(screen.get_size())
+        self.compact = compact
+        self.size = None
+        self.layers = ()
+        self.cache_dir = cache_dir
+        self.cache_budget = cache_budget
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.lock = threading.Lock()
+        self.build_id = 0
+        self.ready = None
+        self.placeholder = None
+        self.update_effects(size or screen.get_size())
 
     def update_effects(self, size):
-        width, height = size
-        self.scanlines = self.create_scanlines(width, height)
-        self.vignette = self.create_vignette(width, height)
+        self.size = tuple(size)
+        key = (*self.size, self.compact)
+        layers = self.cache.get(key)
+        if layers is not None:
+            self.cache.move_to_end(key)
+        else:
+            layers = self.load_layers(key)
+            if layers is None:
+                layers = self.create_layers(*key)
+                self.save_layers(key, layers)
+            self.remember_layers(key, layers)
+        self.layers = layers
+
+    def request_effects(self, size):
+        self.size = tuple(size)
+        key = (*self.size, self.compact)
+        # Any build still running for an earlier size is stale from here on
+        with self.lock:
+            self.build_id += 1
+            build_id = self.build_id
+            self.ready = None
+        if key in self.cache:
+            self.update_effects(self.size)
+            return
+
+        # Build off the main thread; draw() stretches the current overlay until it is ready
+        threading.Thread(target=self.build_in_background, args=(key, build_id), daemon=True).start()
+
+    def build_in_background(self, key, build_id):
+        layers = self.load_layers(key)
+        if layers is None:
+            layers = self.create_layers(*key)
+            self.save_layers(key, layers)
+        with self.lock:
+            if build_id == self.build_id:
+                self.ready = (key, layers)
+        # Wakes the main loop if it is idling in a menu
+        pygame.event.post(pygame.event.Event(CRT_READY_EVENT))
+
+    def set_compact(self, compact):
+        if compact != self.compact:
+            self.compact = compact
+            self.request_effects(self.size)
+
+    def remember_layers(self, key, layers):
+        self.cache[key] = layers
+        self.cache_bytes += sum(layer.get_pitch() * layer.get_height() for layer in layers)
+        # Evict least recently used sizes, but always keep the one just added
+        while self.cache_bytes > self.cache_budget and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= sum(layer.get_pitch() * layer.get_height() for layer in evicted)
+
+    def cache_path(self, key):
+        width, height, compact = key
+        mode = "_compact" if compact else ""
+        return os.path.join(self.cache_dir, f"crt_v{self.CACHE_VERSION}_{width}x{height}{mode}.bin")
+
+    def load_layers(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            path = self.cache_path(key)
+            with open(path, 'rb') as f:
+                data = zlib.decompress(f.read())
+            # Mark as recently used so prune_cache_dir keeps it
+            os.utime(path)
+        except (OSError, zlib.error):
+            return None
+
+        # The overlays are pure black, so only their alpha planes are stored
+        size = key[:2]
+        plane = size[0] * size[1]
+        count = 1 if key[2] else 2
+        if len(data) != plane * count:
+            return None
+        layers = []
+        for offset in range(0, len(data), plane):
+            # Rebuild in the native SRCALPHA format; an RGBA-ordered buffer would take SDL's slow blit path
+            layer = pygame.Surface(size, pygame.SRCALPHA)
+            if np is not None:
+                alpha = pygame.surfarray.pixels_alpha(layer)
+                alpha[...] = np.frombuffer(data, np.uint8, plane, offset).reshape(size[1], size[0]).T
+                del alpha
+            else:
+                rgba = bytearray(plane * 4)
+                rgba[3::4] = data[offset:offset + plane]
+                layer.blit(pygame.image.frombuffer(rgba, size, "RGBA"), (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            layers.append(layer)
+        return tuple(layers)
+
+    def save_layers(self, key, layers):
+        if not self.cache_dir:
+            return
+        data = b"".join(pygame.image.tobytes(layer, "RGBA")[3::4] for layer in layers)
+        path = self.cache_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".tmp", 'wb') as f:
+                f.write(zlib.compress(data, 1))
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return
+        self.prune_cache_dir()
+
+    def prune_cache_dir(self):
+        # Keep only the most recently used sizes on disk
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.startswith("crt_") and name.endswith(".bin")]
+            paths = sorted((os.path.join(self.cache_dir, name) for name in names), key=os.path.getmtime, reverse=True)
+            for path in paths[CRT_CACHE_FILES:]:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def create_layers(self, width, height, compact):
+        if compact:
+            return (self.create_compact_overlay(width, height),)
+        return (self.create_scanlines(width, height), self.create_vignette(width, height))
+
+    def create_compact_overlay(self, width, height):
+        small = self.create_vignette(max(1, width // CRT_COMPACT_SCALE), max(1, height // CRT_COMPACT_SCALE))
+        overlay = pygame.transform.smoothscale(small, (width, height))
+
+        # Both effects are black, so stacking the scanline strip onto the vignette once
+        # gives the same pixels as blending the two full-screen layers every frame
+        strip = pygame.Surface((width, 3), pygame.SRCALPHA)
+        pygame.draw.line(strip, (0, 0, 0, 60), (0, 0), (width, 0), 1)
+        overlay.blits([(strip, (0, y)) for y in range(0, height, 3)], doreturn=False)
+        return overlay
 
     def create_scanlines(self, width, height):
         scanline_surface = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -137,26 +457,600 @@ class CRT:
         center_x, center_y = width // 2, height // 2
         max_radius = math.sqrt(center_x**2 + center_y**2)
 
-        for y in range(height):
-            for x in range(width):
-                dist = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-                alpha = min(150, int(200 * (dist / max_radius)))
-                vignette.set_at((x, y), (0, 0, 0, alpha))
+        if np is None:
+            # Without NumPy: concentric discs, within 2 alpha steps of the exact field
+            vignette.fill((0, 0, 0, 150))
+            for alpha in range(149, -1, -1):
+                pygame.draw.circle(vignette, (0, 0, 0, alpha), (center_x, center_y),
+                                   (alpha + 1) * max_radius / 200)
+            return vignette
+
+        # Alpha only depends on |dx| and |dy|: compute one quadrant and mirror it
+        far_x = max(center_x, width - 1 - center_x)
+        far_y = max(center_y, height - 1 - center_y)
+        dist = np.add.outer(np.arange(far_y + 1) ** 2, np.arange(far_x + 1) ** 2).astype(np.float64)
+        np.sqrt(dist, out=dist)
+        dist /= max_radius
+        dist *= 200
+        np.minimum(dist, 150, out=dist)
+        quadrant = dist.astype(np.uint8)
+
+        alpha = pygame.surfarray.pixels_alpha(vignette).T
+        alpha[center_y:, center_x:] = quadrant[:height - center_y, :width - center_x]
+        alpha[center_y:, :center_x] = quadrant[:height - center_y, center_x:0:-1]
+        alpha[:center_y, center_x:] = quadrant[center_y:0:-1, :width - center_x]
+        alpha[:center_y, :center_x] = quadrant[center_y:0:-1, center_x:0:-1]
+        del alpha
         return vignette
 
     def draw(self, surface=None):
         target = surface if surface else self.screen
-        target.blit(self.scanlines, (0, 0))
-        target.blit(self.vignette, (0, 0))
+        if self.ready is not None:
+            with self.lock:
+                ready, self.ready = self.ready, None
+            if ready is not None and ready[0] == (*self.size, self.compact):
+                key, layers = ready
+                self.remember_layers(key, layers)
+                self.layers = layers
+
+        layers = self.layers
+        size = target.get_size()
+        if layers and layers[0].get_size() != size:
+            if self.placeholder is None or self.placeholder[0] != (size, layers):
+                self.placeholder = ((size, layers), tuple(pygame.transform.scale(layer, size) for layer in layers))
+            layers = self.placeholder[1]
+        for layer in layers:
+            target.blit(layer, (0, 0))
+
+class BloomEffect:
+    def __init__(self, threshold=160, downscale=4):
+        self.threshold = threshold
+        self.downscale = downscale
+        self.buffers = None
+
+    def prepare(self, surface):
+        size = surface.get_size()
+        if self.buffers is not None and self.buffers[0] == size:
+            return self.buffers
+        small_size = (max(1, size[0] // self.downscale), max(1, size[1] // self.downscale))
+        blur_size = (max(1, small_size[0] // 4), max(1, small_size[1] // 4))
+        # Same pixel format as the target so smoothscale can write into them directly
+        self.buffers = (size,
+                        pygame.Surface(small_size, 0, surface),
+                        pygame.Surface(blur_size, 0, surface),
+                        pygame.Surface(size, 0, surface))
+        return self.buffers
+
+    def apply(self, surface):
+        size, small, blur, glow = self.prepare(surface)
+        pygame.transform.smoothscale(surface, small.get_size(), small)
+        # Keep only what is brighter than the threshold, i.e. the neon particles and lights
+        small.fill((self.threshold,) * 3, special_flags=pygame.BLEND_SUB)
+        pygame.transform.smoothscale(small, blur.get_size(), blur)
+        pygame.transform.smoothscale(blur, small.get_size(), small)
+        pygame.transform.smoothscale(small, size, glow)
+        surface.blit(glow, (0, 0), special_flags=pygame.BLEND_ADD)
+
+class ChromaticAberrationEffect:
+    def __init__(self, offset=2):
+        self.offset = offset
+        self.scratch = None
+
+    def apply(self, surface):
+        width, height = surface.get_size()
+        offset = self.offset
+        if width <= offset:
+            return
+        if self.scratch is None or self.scratch.shape != (width - offset, height):
+            self.scratch = np.empty((width - offset, height), dtype=np.uint8)
+
+        # Shift red left and blue right in place, through a reusable scratch channel
+        pixels = pygame.surfarray.pixels3d(surface)
+        np.copyto(self.scratch, pixels[offset:, :, 0])
+        pixels[:-offset, :, 0] = self.scratch
+        np.copyto(self.scratch, pixels[:-offset, :, 2])
+        pixels[offset:, :, 2] = self.scratch
+        del pixels
+
+class PostFX:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.stages = []
+        self.unavailable = set()
+        # Stages the quality governor has switched off, without touching the saved settings
+        self.suppressed = set()
+        self.timings = {}
+
+    def add_stage(self, name, apply, available=True):
+        self.stages.append((name, apply))
+        self.enabled.setdefault(name, True)
+        if not available:
+            self.unavailable.add(name)
+
+    def is_active(self, name):
+        return name not in self.unavailable and name not in self.suppressed and self.enabled.get(name, True)
+
+    def toggle(self, name):
+        self.enabled[name] = not self.enabled.get(name, True)
+
+    def apply(self, surface):
+        for name, apply in self.stages:
+            if not self.is_active(name):
+                self.timings.pop(name, None)
+                continue
+            start = time.perf_counter()
+            apply(surface)
+            elapsed = (time.perf_counter() - start) * 1000
+            # Smoothed so the debug overlay is readable
+            self.timings[name] = self.timings.get(name, elapsed) * 0.9 + elapsed * 0.1
+
+class PalettedSurface(pygame.Surface):
+    # SDL ignores per-pixel alpha when blitting onto 8-bit surfaces and takes a slow path,
+    # so alpha sprites are reduced once to color-keyed 8-bit copies with 1-bit transparency.
+    # Sources are cached by identity: everything blitted whole here comes from an immutable cache
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reduced = weakref.WeakKeyDictionary()
+
+    def reduce(self, source):
+        # Drawn while the untinted palette is set, see PalettedPlayfield.begin
+        opaque = source.convert()
+        pygame.mask.from_surface(source).to_surface(opaque, setsurface=opaque.copy(), unsetcolor=COLOR_KEY)
+        reduced = opaque.convert(self)
+        reduced.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+        return reduced
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if not source.get_flags() & pygame.SRCALPHA:
+            if source.get_bitsize() != 8:
+                # 32-bit strips such as the road markings would be converted on every blit
+                converted = self.reduced.get(source)
+                if converted is None:
+                    converted = source.convert(self)
+                    if source.get_colorkey() is not None:
+                        converted.set_colorkey(source.get_colorkey(), pygame.RLEACCEL)
+                    self.reduced[source] = converted
+                source = converted
+            return super().blit(source, dest, area, special_flags)
+
+        if area is None:
+            # Whole-surface blits are the cached sprites, discs and text, which never change
+            reduced = self.reduced.get(source)
+            if reduced is None:
+                reduced = self.reduce(source)
+                self.reduced[source] = reduced
+            return super().blit(reduced, dest, None, special_flags)
+
+        # Partial blits come from layers redrawn every frame (skid marks), so only the area is reduced
+        area = pygame.Rect(area).clip(source.get_rect())
+        if not area:
+            return pygame.Rect(pygame.Rect(dest).topleft, (0, 0))
+        return super().blit(self.reduce(source.subsurface(area)), dest, None, special_flags)
+
+    def blits(self, blit_sequence, doreturn=1):
+        # The C implementation would bypass the blit override above
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fblits(self, blit_sequence, special_flags=0):
+        # Same for pygame-ce's fblits, which RenderQueue prefers when it exists
+        for source, dest in blit_sequence:
+            self.blit(source, dest, None, special_flags)
+
+class PalettedPlayfield:
+    def __init__(self):
+        self.base_palette = self.create_palette()
+        self.surface = None
+        self.palette_key = None
+        # Tinted palettes by (tint, flash); a steady tint is then just a swap between two lists
+        self.palettes = {((1.0, 1.0, 1.0), 0): self.base_palette}
+
+    @staticmethod
+    def create_palette():
+        palette = [BLACK, DARK_GRAY, RED, WHITE, YELLOW, BLUE, GRAY, GREEN, PURPLE, ORANGE, CYAN, PINK,
+                   (150, 150, 150), (200, 200, 200), (255, 100, 0), COLOR_KEY]
+        for r in range(6):
+            for g in range(6):
+                for b in range(6):
+                    color = (r * 51, g * 51, b * 51)
+                    if color not in palette:
+                        palette.append(color)
+        # Fill the rest with a gray ramp for smoke and asphalt shades
+        ramp = 256 - len(palette)
+        for i in range(ramp):
+            level = 10 + i * 235 // max(1, ramp - 1)
+            palette.append((level, level, level))
+        return palette
+
+    def begin(self, size):
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = PalettedSurface(size, 0, 8)
+            self.palette_key = None
+        # Draw against the untinted palette so colors map to their usual indices
+        if self.palette_key != ((1.0, 1.0, 1.0), 0):
+            self.surface.set_palette(self.base_palette)
+            self.palette_key = ((1.0, 1.0, 1.0), 0)
+        return self.surface
+
+    def present(self, target, tint=(1.0, 1.0, 1.0), flash=0):
+        key = (tuple(tint), flash)
+        if key != self.palette_key:
+            palette = self.palettes.get(key)
+            if palette is None:
+                palette = [self.tint_color(color, tint, flash) for color in self.base_palette]
+                # Combo flashes fade through ~10 levels per tint, so this stays small
+                self.palettes[key] = palette
+            self.surface.set_palette(palette)
+            self.palette_key = key
+        target.blit(self.surface, (0, 0))
+
+    @staticmethod
+    def tint_color(color, tint, flash):
+        # flash is the alpha of a white overlay, as used by the 32-bit combo flash
+        return tuple(min(255, int(channel * factor)) * (255 - flash) // 255 + flash
+                     for channel, factor in zip(color, tint))
+
+class OverlayManager:
+    def __init__(self):
+        self.size = None
+        self.fills = {}
+        self.layers = {}
+
+    def check_size(self, size):
+        # Everything here is full-screen sized, so a resize invalidates it all
+        if size != self.size:
+            self.size = size
+            self.fills.clear()
+            self.layers.clear()
+
+    def fill(self, target, color, alpha):
+        self.check_size(target.get_size())
+        key = tuple(color)
+        overlay = self.fills.get(key)
+        if overlay is None:
+            # Opaque surface with surface alpha blends the same as a per-pixel alpha fill, only faster
+            overlay = pygame.Surface(self.size)
+            overlay.fill(color)
+            self.fills[key] = overlay
+        if overlay.get_alpha() != alpha:
+            overlay.set_alpha(alpha)
+        target.blit(overlay, (0, 0))
+
+    def draw_layer(self, target, name, content, render):
+        self.check_size(target.get_size())
+        cached = self.layers.get(name)
+        if cached is None or cached[0] != content:
+            layer = pygame.Surface(self.size, pygame.SRCALPHA)
+            render(layer)
+            # Keep only the part that was drawn on
+            bounds = layer.get_bounding_rect()
+            cached = (content, layer.subsurface(bounds).copy(), bounds.topleft)
+            self.layers[name] = cached
+        target.blit(cached[1], cached[2])
+
+class RenderLayer:
+    # Stands in for the target surface while entities draw, so their blits can be batched
+    def __init__(self, queue):
+        self.queue = queue
+        self.items = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if area is not None or special_flags:
+            self.items.append((source, dest, area, special_flags))
+        else:
+            self.items.append((source, dest))
+
+    def blits(self, blit_sequence, doreturn=1):
+        self.items.extend(blit_sequence)
+
+    def get_size(self):
+        return self.queue.target.get_size()
+
+    def get_bitsize(self):
+        return self.queue.target.get_bitsize()
+
+class RenderQueue:
+    def __init__(self, layer_names):
+        self.target = None
+        self.layers = {name: RenderLayer(self) for name in layer_names}
+
+    def begin(self, target):
+        self.target = target
+        for layer in self.layers.values():
+            layer.items.clear()
+
+    def layer(self, name):
+        return self.layers[name]
+
+    def flush(self):
+        # One C-level call per layer, in the order the layers were declared
+        target = self.target
+        fblits = getattr(target, "fblits", None)
+        for layer in self.layers.values():
+            items = layer.items
+            if not items:
+                continue
+            if fblits is not None and all(len(item) == 2 for item in items):
+                fblits(items)
+            else:
+                target.blits(items, doreturn=False)
+            items.clear()
+
+class QualityGovernor:
+    TIERS = [
+        {"name": "HIGH", "crt": "full", "postfx_off": (), "max_particles": None, "trail_every": 1, "rotation_step": 0},
+        {"name": "MEDIUM", "crt": "compact", "postfx_off": ("aberration",), "max_particles": 150, "trail_every": 2, "rotation_step": 0},
+        {"name": "LOW", "crt": "compact", "postfx_off": ("bloom", "aberration"), "max_particles": 60, "trail_every": 3, "rotation_step": 5},
+        {"name": "MINIMAL", "crt": "off", "postfx_off": ("bloom", "aberration"), "max_particles": 25, "trail_every": 4, "rotation_step": 90},
+    ]
+
+    def __init__(self, budget_ms=1000 / FPS, window=60):
+        self.budget_ms = budget_ms
+        self.samples = deque(maxlen=window)
+        self.tier = 0
+        self.cooldown = 0
+
+    @property
+    def quality(self):
+        return self.TIERS[self.tier]
+
+    def average(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0
+
+    def record(self, frame_ms):
+        self.samples.append(frame_ms)
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        # Wide gap between the two thresholds so tiers do not oscillate
+        average = self.average()
+        if average > self.budget_ms * 0.9 and self.tier < len(self.TIERS) - 1:
+            self.tier += 1
+        elif average < self.budget_ms * 0.5 and self.tier > 0:
+            self.tier -= 1
+        else:
+            return False
+        self.samples.clear()
+        self.cooldown = self.samples.maxlen
+        return True
+
+class CircleSpriteCache:
+    def __init__(self, max_entries=SPRITE_CACHE_SIZE, alpha_step=SPRITE_ALPHA_STEP):
+        self.max_entries = max_entries
+        self.alpha_step = alpha_step
+        self.sprites = OrderedDict()
+
+    def quantize(self, alpha):
+        # Nearby alphas share a sprite, the difference is not visible on a fading particle.
+        # Works on ints and NumPy arrays alike
+        return (alpha + self.alpha_step // 2) // self.alpha_step * self.alpha_step
+
+    def get(self, size, color):
+        r, g, b, alpha = color
+        return self.lookup((size, r, g, b, min(255, self.quantize(alpha))))
+
+    def lookup(self, key):
+        # key is (size, r, g, b, alpha) with alpha already quantized
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        size, r, g, b, alpha = key
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (r, g, b, alpha), (size//2, size//2), size//2)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_entries:
+            self.sprites.popitem(last=False)
+        return sprite
+
+class ParticleSystem:
+    # Row of each particle field in the structure-of-arrays storage
+    X, Y, VX, VY, GRAVITY, LIFE, MAX_LIFE, SIZE, R, G, B, ALPHA, FADE = range(13)
+    FIELDS = 13
+    sprites = CircleSpriteCache()
+
+    def __init__(self, capacity=1024):
+        self.count = 0
+        if np is not None:
+            self.data = np.zeros((self.FIELDS, capacity))
+        else:
+            self.data = []
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        if np is None:
+            self.data.clear()
+
+    def emit(self, x, y, vx, vy, life, size, color, alpha=255, fade=True, gravity=0.0):
+        r, g, b = color[:3]
+        values = (x, y, vx, vy, gravity, life, life, size, r, g, b, alpha, 1.0 if fade else 0.0)
+        if np is None:
+            self.data.append(list(values))
+            self.count += 1
+            return
+        if self.count == self.data.shape[1]:
+            self.grow(self.count * 2)
+        self.data[:, self.count] = values
+        self.count += 1
+
+    def burst(self, x, y, count, colors, vx_range, vy_range, size_range, life, gravity=0.0):
+        if np is None:
+            for _ in range(count):
+                self.emit(x, y, random.uniform(*vx_range), random.uniform(*vy_range), life,
+                          random.randint(*size_range), random.choice(colors), gravity=gravity)
+            return
+        if self.count + count > self.data.shape[1]:
+            self.grow(max(self.count + count, self.data.shape[1] * 2))
+        block = self.data[:, self.count:self.count + count]
+        block[self.X] = x
+        block[self.Y] = y
+        block[self.VX] = np.random.uniform(*vx_range, count)
+        block[self.VY] = np.random.uniform(*vy_range, count)
+        block[self.GRAVITY] = gravity
+        block[self.LIFE] = life
+        block[self.MAX_LIFE] = life
+        block[self.SIZE] = np.random.randint(size_range[0], size_range[1] + 1, count)
+        palette = np.array([color[:3] for color in colors], dtype=float)
+        block[self.R:self.B + 1] = palette[np.random.randint(0, len(colors), count)].T
+        block[self.ALPHA] = 255
+        block[self.FADE] = 1.0
+        self.count += count
+
+    def grow(self, capacity):
+        data = np.zeros((self.FIELDS, capacity))
+        data[:, :self.count] = self.data[:, :self.count]
+        self.data = data
+
+    def update(self):
+        if np is None:
+            self.update_python()
+            return
+        live = self.data[:, :self.count]
+        live[self.X] += live[self.VX]
+        live[self.Y] += live[self.VY]
+        live[self.LIFE] -= 1
+        live[self.VY] += live[self.GRAVITY]
+
+        dead = np.flatnonzero(live[self.LIFE] <= 0)
+        if dead.size:
+            # Swap-remove: survivors from the tail fill the holes left below the new count
+            remaining = self.count - dead.size
+            holes = dead[dead < remaining]
+            movers = np.flatnonzero(live[self.LIFE, remaining:] > 0) + remaining
+            live[:, holes] = live[:, movers]
+            self.count = remaining
+
+    def update_python(self):
+        particles = self.data
+        i = 0
+        while i < len(particles):
+            particle = particles[i]
+            particle[self.X] += particle[self.VX]
+            particle[self.Y] += particle[self.VY]
+            particle[self.LIFE] -= 1
+            particle[self.VY] += particle[self.GRAVITY]
+            if particle[self.LIFE] <= 0:
+                particles[i] = particles[-1]
+                particles.pop()
+            else:
+                i += 1
+        self.count = len(particles)
+
+    def visible(self):
+        # (x, y, size, color) for every live particle, alpha already faded by remaining life
+        if np is None:
+            for p in self.data:
+                fade = p[self.LIFE] / p[self.MAX_LIFE] if p[self.FADE] else 1
+                yield (int(p[self.X]), int(p[self.Y]), int(p[self.SIZE]),
+                       (int(p[self.R]), int(p[self.G]), int(p[self.B]), int(p[self.ALPHA] * fade)))
+            return
+        live = self.data[:, :self.count]
+        fade = np.where(live[self.FADE] > 0, live[self.LIFE] / live[self.MAX_LIFE], 1.0)
+        alpha = (live[self.ALPHA] * fade).astype(int)
+        rgb = live[self.R:self.B + 1].astype(int)
+        yield from zip(live[self.X].astype(int).tolist(), live[self.Y].astype(int).tolist(),
+                       live[self.SIZE].astype(int).tolist(),
+                       zip(rgb[0].tolist(), rgb[1].tolist(), rgb[2].tolist(), alpha.tolist()))
+
+    def draw(self, screen):
+        if np is None:
+            get = self.sprites.get
+            screen.blits([(get(size, color), (x, y)) for x, y, size, color in self.visible()], doreturn=False)
+            return
+        if not self.count:
+            return
+
+        # Sprite keys are packed into one integer per particle so each distinct sprite is
+        # looked up once per frame instead of once per particle
+        live = self.data[:, :self.count]
+        fade = np.where(live[self.FADE] > 0, live[self.LIFE] / live[self.MAX_LIFE], 1.0)
+        alpha = np.minimum(self.sprites.quantize((live[self.ALPHA] * fade).astype(np.int64)), 255)
+        size, r, g, b = live[[self.SIZE, self.R, self.G, self.B]].astype(np.int64)
+        keys = (size << 32) | (r << 24) | (g << 16) | (b << 8) | alpha
+        unique, inverse = np.unique(keys, return_inverse=True)
+        lookup = self.sprites.lookup
+        sprites = np.empty(len(unique), dtype=object)
+        sprites[:] = [lookup((key >> 32, key >> 24 & 255, key >> 16 & 255, key >> 8 & 255, key & 255))
+                      for key in unique.tolist()]
+        positions = zip(live[self.X].astype(int).tolist(), live[self.Y].astype(int).tolist())
+        screen.blits(zip(sprites[inverse].tolist(), positions), doreturn=False)
+
+class SkidMarkLayer:
+    # Trails are stamped once into this layer, which then scrolls with the road and fades as a whole
+    def __init__(self, fade=SKID_MARK_FADE):
+        self.fade = fade
+        self.surface = None
+        self.dirty = None
+        self.scroll_remainder = 0.0
+        self.idle_frames = 0
+        # Frames after which the last stamp has faded out completely
+        self.lifetime = 0
+        alpha = 255
+        while alpha > 0:
+            alpha = alpha * fade // 255
+            self.lifetime += 1
+
+    def stamp(self, x, y, size, color, alpha):
+        if self.surface is None:
+            return
+        rect = self.surface.blit(ParticleSystem.sprites.get(size, (*color, alpha)), (x, y))
+        self.dirty = rect if self.dirty is None else self.dirty.union(rect)
+        self.idle_frames = 0
+
+    def update(self, speed):
+        # Only the band that has marks in it is scrolled, faded and drawn; blended fills are slow
+        if self.dirty is None:
+            return
+        self.scroll_remainder += speed
+        offset = int(self.scroll_remainder)
+        self.scroll_remainder -= offset
+        if offset > 0:
+            moved = self.dirty.move(0, offset).clip(self.surface.get_rect())
+            band = self.dirty.union(moved) if moved else self.dirty
+            self.surface.subsurface(band).scroll(0, offset)
+            self.surface.fill((0, 0, 0, 0), (band.x, band.y, band.width, min(offset, band.height)))
+            self.dirty = moved
+
+        self.idle_frames += 1
+        if not self.dirty or self.idle_frames >= self.lifetime:
+            self.surface.fill((0, 0, 0, 0))
+            self.dirty = None
+            return
+        self.surface.fill((255, 255, 255, self.fade), self.dirty, special_flags=pygame.BLEND_RGBA_MULT)
+
+    def draw(self, screen):
+        size = screen.get_size()
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.dirty = None
+            return
+        if self.dirty is not None:
+            screen.blit(self.surface, self.dirty, self.dirty)
 
 class DriftEffect:
     def __init__(self):
-        self.particles = []
-        self.trails = []
+        self.particles = ParticleSystem()
+        self.trails = ParticleSystem()
         self.lightning_timer = 0
         self.combo_flash = 0
+        self.max_particles = None
+        self.trail_every = 1
+        self.trail_counter = 0
+        self.skid_marks = None
+        self.overlays = OverlayManager()
 
     def add_particle(self, x, y, drift_power, drift_combo):
+        if self.max_particles is not None and len(self.particles) >= self.max_particles:
+            return
         if drift_combo >= 10:
             for _ in range(3):
                 color = random.choice([CYAN, PINK, YELLOW, WHITE])
@@ -164,11 +1058,8 @@ class DriftEffect:
                 speed = random.uniform(1, 3)
                 angle = random.uniform(0, 2 * math.pi)
                 life = random.randint(20, 40)
-                self.particles.append({
-                    'x': x, 'y': y, 'color': color, 'size': size,
-                    'vx': math.cos(angle) * speed, 'vy': math.sin(angle) * speed,
-                    'life': life, 'max_life': life
-                })
+                self.particles.emit(x, y, math.cos(angle) * speed, math.sin(angle) * speed,
+                                    life, size, color, gravity=0.1)
         elif drift_combo >= 5:
             for _ in range(2):
                 color = random.choice([YELLOW, WHITE, ORANGE])
@@ -176,83 +1067,138 @@ class DriftEffect:
                 speed = random.uniform(0.5, 2)
                 angle = random.uniform(0, 2 * math.pi)
                 life = random.randint(15, 30)
-                self.particles.append({
-                    'x': x, 'y': y, 'color': color, 'size': size,
-                    'vx': math.cos(angle) * speed, 'vy': math.sin(angle) * speed,
-                    'life': life, 'max_life': life
-                })
+                self.particles.emit(x, y, math.cos(angle) * speed, math.sin(angle) * speed,
+                                    life, size, color, gravity=0.1)
         else:
-            color = (200, 200, 200, random.randint(100, 200))
             size = random.randint(10, 25)
-            self.particles.append({
-                'x': x, 'y': y, 'color': color, 'size': size,
-                'vx': random.uniform(-1, 1), 'vy': random.uniform(-2, 0),
-                'life': 30, 'max_life': 30
-            })
+            # Smoke keeps its alpha for its whole life
+            self.particles.emit(x, y, random.uniform(-1, 1), random.uniform(-2, 0), 30, size,
+                                (200, 200, 200), alpha=random.randint(100, 200), fade=False, gravity=0.1)
 
     def add_trail(self, x, y, drift_angle, drift_power):
+        self.trail_counter += 1
+        if self.trail_counter % self.trail_every:
+            return
         intensity = min(255, 100 + int(drift_power * 1.5))
-        color = (255, 255, 0, intensity)
+        color = (255, 255, 0)
 
         if drift_power > 80:
-            color = (255, 0, 0, intensity)
+            color = (255, 0, 0)
         elif drift_power > 60:
-            color = (255, 165, 0, intensity)
-
-        self.trails.append({
-            'x': x, 'y': y, 'color': color,
-            'width': int(10 + drift_power * 0.2),
-            'life': 20
-        })
-
-    def update(self):
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['vy'] += 0.1
+            color = (255, 165, 0)
 
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        # Trails don't move, so store them by their top-left corner
+        width = int(10 + drift_power * 0.2)
+        if self.skid_marks is not None:
+            self.skid_marks.stamp(x - width//2, y - width//2, width, color, intensity)
+            return
+        self.trails.emit(x - width//2, y - width//2, 0, 0, 20, width, color, alpha=intensity)
 
-        for trail in self.trails[:]:
-            trail['life'] -= 1
-            if trail['life'] <= 0:
-                self.trails.remove(trail)
+    def update(self, speed=0):
+        self.particles.update()
+        self.trails.update()
+        if self.skid_marks is not None:
+            self.skid_marks.update(speed)
 
         self.lightning_timer = max(0, self.lightning_timer - 1)
         self.combo_flash = max(0, self.combo_flash - 1)
 
     def draw(self, screen):
-        for trail in self.trails:
-            alpha = int(trail['color'][3] * (trail['life'] / 20))
-            trail_color = (*trail['color'][:3], alpha)
-            trail_surface = pygame.Surface((trail['width'], trail['width']), pygame.SRCALPHA)
-            pygame.draw.circle(trail_surface, trail_color,
-                             (trail['width']//2, trail['width']//2), trail['width']//2)
-            screen.blit(trail_surface, (trail['x'] - trail['width']//2, trail['y'] - trail['width']//2))
-
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-            if len(particle['color']) == 3:
-                color_with_alpha = (*particle['color'], alpha)
-            else:
-                color_with_alpha = particle['color']
-
-            surf = pygame.Surface((particle['size'], particle['size']), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color_with_alpha,
-                             (particle['size']//2, particle['size']//2), particle['size']//2)
-            screen.blit(surf, (int(particle['x']), int(particle['y'])))
+        self.trails.draw(screen)
+        self.particles.draw(screen)
 
-        if self.combo_flash > 0:
+        # Paletted playfields flash by brightening the palette instead
+        if self.combo_flash > 0 and screen.get_bitsize() > 8:
             flash_alpha = int(100 * (self.combo_flash / 10))
-            flash_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            flash_surface.fill((255, 255, 255, flash_alpha))
-            screen.blit(flash_surface, (0, 0))
+            self.overlays.fill(screen, WHITE, flash_alpha)
 
     def trigger_combo_flash(self):
         self.combo_flash = 10
 
+class LaneLayout(namedtuple("LaneLayout", "screen_width road_width lane_count left lanes_x dividers")):
+    # Shared by every car on the road; a resize swaps the reference instead of rebuilding tables
+    layouts = {}
+
+    @staticmethod
+    def get(screen_width, lane_count):
+        key = (screen_width, lane_count)
+        layout = LaneLayout.layouts.get(key)
+        if layout is None:
+            road_width = max(ROAD_WIDTH, lane_count * 100)
+            left = screen_width//2 - road_width//2
+            lanes_x = tuple(left + ((2 * i + 1) * road_width) // (2 * lane_count) for i in range(lane_count))
+            dividers = tuple(left + (road_width * i) // lane_count for i in range(1, lane_count))
+            layout = LaneLayout(screen_width, road_width, lane_count, left, lanes_x, dividers)
+            LaneLayout.layouts[key] = layout
+        return layout
+
+class CarSpriteAtlas:
+    # Car bodies are rendered once per (car type, variant, size) and reused by every draw
+    def __init__(self, max_rotations=ROTATION_CACHE_SIZE):
+        self.sprites = {}
+        self.max_rotations = max_rotations
+        self.rotations = OrderedDict()
+
+    def get(self, car_type, variant, size=(40, 70)):
+        key = (car_type, variant, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.render(car_type, variant, size)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.sprites[key] = sprite
+        return sprite
+
+    def render(self, car_type, variant, size):
+        width, height = size
+        car_surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(car_surface, car_type.value["color"], (0, 0, width, height))
+        pygame.draw.rect(car_surface, BLACK, (0, 0, width, height), 2)
+
+        pygame.draw.rect(car_surface, YELLOW, (5, 5, 8, 5))
+        pygame.draw.rect(car_surface, YELLOW, (width-13, 5, 8, 5))
+
+        # Traffic and the bot only show headlights; the selection preview has its taillights a bit higher
+        if variant == "player":
+            pygame.draw.rect(car_surface, RED, (5, height-10, 8, 5))
+            pygame.draw.rect(car_surface, RED, (width-13, height-10, 8, 5))
+        elif variant == "preview":
+            pygame.draw.rect(car_surface, RED, (5, height-15, 8, 5))
+            pygame.draw.rect(car_surface, RED, (width-13, height-15, 8, 5))
+
+        if variant == "player" and car_type == CarType.AE86:
+            font = FONTS.get('Arial', 10, bold=True)
+            text = font.render("INITIAL D", True, RED)
+            car_surface.blit(text, (width//2 - text.get_width()//2, height//2 - 5))
+        return car_surface
+
+    def rotated(self, car_type, variant, size, angle, step):
+        angle = round(snap_angle(angle, step), 3)
+        key = (car_type, variant, size, angle)
+        sprite = self.rotations.get(key)
+        if sprite is not None:
+            self.rotations.move_to_end(key)
+            return sprite
+
+        sprite = pygame.transform.rotate(self.get(car_type, variant, size), angle)
+        self.rotations[key] = sprite
+        if len(self.rotations) > self.max_rotations:
+            self.rotations.popitem(last=False)
+        return sprite
+
+    def prewarm(self, car_type, variant, max_angle, step, size=(40, 70)):
+        if not step:
+            return
+        for i in range(-int(max_angle / step) - 1, int(max_angle / step) + 2):
+            self.rotated(car_type, variant, size, i * step, step)
+
+def snap_angle(angle, step):
+    if not step:
+        return angle
+    return round(angle / step) * step
+
+CAR_SPRITES = CarSpriteAtlas()
+
 class PlayerCar:
     def __init__(self, car_type, screen_width, screen_height, num_lanes=3, insane_mode=False):
         self.car_type = car_type
@@ -264,32 +1210,10 @@ class PlayerCar:
         self.num_lanes = num_lanes
         self.insane_mode = insane_mode
 
-        # Fixed lane positioning to prevent overlap
-        if num_lanes == 4:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + ROAD_WIDTH//8,
-                screen_width//2 - ROAD_WIDTH//4 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//4 + ROAD_WIDTH//8
-            ]
-            self.lane = 1
-        elif num_lanes == 3:
-            # Better spaced lanes for 3-lane mode
-            lane_spacing = ROAD_WIDTH // 3
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + lane_spacing//2,
-                screen_width//2,
-                screen_width//2 + ROAD_WIDTH//2 - lane_spacing//2
-            ]
-            self.lane = 1
-        else:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//4,
-                screen_width//2 + ROAD_WIDTH//4
-            ]
-            self.lane = 0
+        self.layout = LaneLayout.get(screen_width, num_lanes)
+        self.lane = (num_lanes - 1) // 2
 
-        self.x = self.lanes_x[self.lane]
+        self.x = self.layout.lanes_x[self.lane]
         self.y = screen_height - 100
         self.speed = 0
 
@@ -298,7 +1222,7 @@ class PlayerCar:
         self.acceleration = 0.2 * self.stats["acceleration"] * speed_multiplier
         self.deceleration = 0.1
         self.handling = 4 * self.stats["handling"]
-        self.target_x = self.lanes_x[self.lane]
+        self.target_x = self.layout.lanes_x[self.lane]
         self.drift_angle = 0
         self.drift_power = 0
         self.nitro = 100
@@ -313,38 +1237,20 @@ class PlayerCar:
         self.drift_slowdown = self.stats["drift_slowdown"]
         self.drift_effect = DriftEffect()
         self.max_drift_combo = 0
+        self.rotation_step = 0
 
     def update_size(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
 
-        # Update lane positions with proper spacing
-        if self.num_lanes == 4:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + ROAD_WIDTH//8,
-                screen_width//2 - ROAD_WIDTH//4 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//4 + ROAD_WIDTH//8
-            ]
-        elif self.num_lanes == 3:
-            lane_spacing = ROAD_WIDTH // 3
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + lane_spacing//2,
-                screen_width//2,
-                screen_width//2 + ROAD_WIDTH//2 - lane_spacing//2
-            ]
-        else:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//4,
-                screen_width//2 + ROAD_WIDTH//4
-            ]
+        self.layout = LaneLayout.get(screen_width, self.num_lanes)
 
         # FIX: Ensure lane index is within bounds after resize
-        if self.lane >= len(self.lanes_x):
-            self.lane = len(self.lanes_x) - 1
+        if self.lane >= self.num_lanes:
+            self.lane = self.num_lanes - 1
             
-        self.x = self.lanes_x[self.lane]
-        self.target_x = self.lanes_x[self.lane]
+        self.x = self.layout.lanes_x[self.lane]
+        self.target_x = self.layout.lanes_x[self.lane]
         self.y = screen_height - 100
 
     def update(self, keys, turn_direction, turn_intensity):
@@ -365,7 +1271,7 @@ class PlayerCar:
             else:
                 self.target_x -= turn_factor
 
-            self.target_x = max(self.lanes_x[0], min(self.lanes_x[-1], self.target_x))
+            self.target_x = max(self.layout.lanes_x[0], min(self.layout.lanes_x[-1], self.target_x))
 
         self.is_drifting = keys[pygame.K_z] and abs(self.speed) > 3
         if self.is_drifting:
@@ -430,41 +1336,71 @@ class PlayerCar:
         if pygame.time.get_ticks() - self.last_overtake > 2000:
             self.combo = max(0, self.combo - 1)
 
-        self.drift_effect.update()
+        self.drift_effect.update(self.speed)
 
     def draw(self, screen, turn_direction, turn_intensity):
         self.drift_effect.draw(screen)
 
-        car_color = self.stats["color"]
         car_rect = pygame.Rect(0, 0, self.width, self.height)
         car_rect.center = (self.x, self.y)
 
-        car_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-
-        pygame.draw.rect(car_surface, car_color, (0, 0, self.width, self.height))
-        pygame.draw.rect(car_surface, BLACK, (0, 0, self.width, self.height), 2)
-
-        pygame.draw.rect(car_surface, YELLOW, (5, 5, 8, 5))
-        pygame.draw.rect(car_surface, YELLOW, (self.width-13, 5, 8, 5))
-        pygame.draw.rect(car_surface, RED, (5, self.height-10, 8, 5))
-        pygame.draw.rect(car_surface, RED, (self.width-13, self.height-10, 8, 5))
-
-        if self.car_type == CarType.AE86:
-            font = pygame.font.SysFont('Arial', 10, bold=True)
-            text = font.render("INITIAL D", True, RED)
-            car_surface.blit(text, (self.width//2 - text.get_width()//2, self.height//2 - 5))
-
         total_angle = self.drift_angle
         if turn_direction != TurnDirection.STRAIGHT:
             turn_angle = turn_intensity * 5 * (1 if turn_direction == TurnDirection.LEFT else -1)
             total_angle += turn_angle * (0.5 if self.is_drifting else 0.2)
 
-        rotated_car = pygame.transform.rotate(car_surface, total_angle)
+        rotated_car = CAR_SPRITES.rotated(self.car_type, "player", (self.width, self.height), total_angle, self.rotation_step)
         rotated_rect = rotated_car.get_rect(center=car_rect.center)
         screen.blit(rotated_car, rotated_rect)
 
+class EntityPool:
+    # Active entities plus a bounded free list; entities implement spawn() to be reinitialized on reuse
+    def __init__(self, entity_type, capacity):
+        self.entity_type = entity_type
+        self.capacity = capacity
+        self.active = []
+        self.free = []
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.spawn(*args)
+        else:
+            entity = self.entity_type(*args)
+        entity.pool_index = len(self.active)
+        self.active.append(entity)
+        return entity
+
+    def release(self, entity):
+        # Swap-remove: the last active entity takes over the released slot
+        index = entity.pool_index
+        last = self.active.pop()
+        if last is not entity:
+            self.active[index] = last
+            last.pool_index = index
+        if len(self.free) < self.capacity:
+            self.free.append(entity)
+
+    def release_all(self):
+        for entity in self.active:
+            if len(self.free) < self.capacity:
+                self.free.append(entity)
+        self.active.clear()
+
 class EnemyCar:
+    __slots__ = ("type", "stats", "width", "height", "screen_width", "screen_height", "num_lanes", "layout",
+                 "lane", "x", "y", "speed", "passed", "turn_offset", "rotation_step", "pool_index")
+
     def __init__(self, player_speed, turn_direction, turn_intensity, screen_width, screen_height, num_lanes=3, insane_mode=False):
+        self.spawn(player_speed, turn_direction, turn_intensity, screen_width, screen_height, num_lanes, insane_mode)
+
+    def spawn(self, player_speed, turn_direction, turn_intensity, screen_width, screen_height, num_lanes=3, insane_mode=False):
         self.type = random.choice(list(CarType))
         self.stats = self.type.value
         self.width = 40
@@ -473,65 +1409,28 @@ class EnemyCar:
         self.screen_height = screen_height
         self.num_lanes = num_lanes
 
-        # Use the same lane positioning as PlayerCar
-        if num_lanes == 4:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + ROAD_WIDTH//8,
-                screen_width//2 - ROAD_WIDTH//4 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//4 + ROAD_WIDTH//8
-            ]
-        elif num_lanes == 3:
-            lane_spacing = ROAD_WIDTH // 3
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + lane_spacing//2,
-                screen_width//2,
-                screen_width//2 + ROAD_WIDTH//2 - lane_spacing//2
-            ]
-        else:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//4,
-                screen_width//2 + ROAD_WIDTH//4
-            ]
-
+        self.layout = LaneLayout.get(screen_width, num_lanes)
         self.lane = random.randint(0, self.num_lanes - 1)
-        self.x = self.lanes_x[self.lane]
+        self.x = self.layout.lanes_x[self.lane]
         self.y = -100
 
         speed_multiplier = 1.5 if insane_mode else 1.0
         self.speed = random.uniform(MIN_ENEMY_SPEED, MAX_ENEMY_SPEED) * speed_multiplier + player_speed * 0.3
         self.passed = False
         self.turn_offset = 0
+        self.rotation_step = 0
 
     def update_size(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
 
-        if self.num_lanes == 4:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + ROAD_WIDTH//8,
-                screen_width//2 - ROAD_WIDTH//4 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//4 + ROAD_WIDTH//8
-            ]
-        elif self.num_lanes == 3:
-            lane_spacing = ROAD_WIDTH // 3
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + lane_spacing//2,
-                screen_width//2,
-                screen_width//2 + ROAD_WIDTH//2 - lane_spacing//2
-            ]
-        else:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//4,
-                screen_width//2 + ROAD_WIDTH//4
-            ]
+        self.layout = LaneLayout.get(screen_width, self.num_lanes)
 
         # FIX: Ensure lane index is within bounds after resize
-        if self.lane >= len(self.lanes_x):
-            self.lane = len(self.lanes_x) - 1
+        if self.lane >= self.num_lanes:
+            self.lane = self.num_lanes - 1
             
-        self.x = self.lanes_x[self.lane]
+        self.x = self.layout.lanes_x[self.lane]
 
     def update(self, player_speed, turn_direction, turn_intensity):
         self.y += self.speed
@@ -543,27 +1442,19 @@ class EnemyCar:
             else:
                 self.turn_offset -= turn_factor
 
-        self.x = self.lanes_x[self.lane] + self.turn_offset
+        self.x = self.layout.lanes_x[self.lane] + self.turn_offset
 
         return self.y > self.screen_height + 100
 
     def draw(self, screen, turn_direction, turn_intensity):
-        color = self.stats["color"]
         car_rect = pygame.Rect(0, 0, self.width, self.height)
         car_rect.center = (self.x, self.y)
 
-        car_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(car_surface, color, (0, 0, self.width, self.height))
-        pygame.draw.rect(car_surface, BLACK, (0, 0, self.width, self.height), 2)
-
-        pygame.draw.rect(car_surface, YELLOW, (5, 5, 8, 5))
-        pygame.draw.rect(car_surface, YELLOW, (self.width-13, 5, 8, 5))
-
         turn_angle = 0
         if turn_direction != TurnDirection.STRAIGHT:
             turn_angle = turn_intensity * 3 * (1 if turn_direction == TurnDirection.LEFT else -1)
 
-        rotated_car = pygame.transform.rotate(car_surface, turn_angle)
+        rotated_car = CAR_SPRITES.rotated(self.type, "traffic", (self.width, self.height), turn_angle, self.rotation_step)
         rotated_rect = rotated_car.get_rect(center=car_rect.center)
         screen.blit(rotated_car, rotated_rect)
 
@@ -579,10 +1470,14 @@ class Road:
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.num_lanes = num_lanes
+        self.layout = LaneLayout.get(screen_width, num_lanes)
         self.line_height = 40
         self.line_width = 10
         self.line_spacing = 60
-        self.line_positions = []
+        # Phase of the scrolling center line; the first line starts just above the screen
+        self.line_offset = -self.line_height % self.line_spacing
+        self.markings = None
+        self.marking_runs = None
         self.speed = 0
         self.curve = 0
         self.curve_target = 0
@@ -591,16 +1486,10 @@ class Road:
         self.turn_intensity = 0
         self.turn_progress = 0
 
-        for y in range(-self.line_height, screen_height + self.line_height, self.line_spacing):
-            self.line_positions.append(y)
-
     def update_size(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
-
-        self.line_positions = []
-        for y in range(-self.line_height, screen_height + self.line_height, self.line_spacing):
-            self.line_positions.append(y)
+        self.layout = LaneLayout.get(screen_width, self.num_lanes)
 
     def update(self, speed):
         self.speed = speed
@@ -624,50 +1513,75 @@ class Road:
         if self.current_turn != TurnDirection.STRAIGHT:
             self.turn_progress = min(100, self.turn_progress + 0.5)
 
-        for i in range(len(self.line_positions)):
-            self.line_positions[i] += speed
-            if self.line_positions[i] > self.screen_height + self.line_height:
-                self.line_positions[i] = -self.line_height
+        self.line_offset = (self.line_offset + speed) % self.line_spacing
+
+    def build_markings(self):
+        # Borders and lane dividers repeat every 40 rows, so one strip that much taller than the
+        # screen covers any band of rows as a sub-rect starting within its first period
+        layout = self.layout
+        width = layout.road_width + 40
+        strip = pygame.Surface((width, self.screen_height + 40)).convert()
+        strip.fill(COLOR_KEY)
+        for y in range(0, strip.get_height(), 20):
+            strip.fill(GRAY, (0, y, 20, 10))
+            strip.fill(GRAY, (width - 20, y, 20, 10))
+        for y in range(0, strip.get_height(), 40):
+            for divider_x in layout.dividers:
+                strip.fill((150, 150, 150), (20 + divider_x - layout.left - 1, y, 2, 20))
+        # RLE skips the transparent asphalt between the markings almost for free
+        strip.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+        self.markings = ((layout, self.screen_height), strip)
+
+    def curve_runs(self):
+        # Each 20-row band is shifted by the curve at its top, like the individual markings were;
+        # neighbouring bands with the same whole-pixel shift are merged into one run. Floor, not int(),
+        # so left curves round the same way the per-marking x coordinates used to
+        if np is not None:
+            tops = np.arange(0, self.screen_height, 20)
+            shifts = np.floor(self.curve * (tops / self.screen_height) * 0.5).astype(int)
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(shifts)) + 1))
+            ends = np.append(tops[starts[1:]], self.screen_height)
+            return list(zip(tops[starts].tolist(), ends.tolist(), shifts[starts].tolist()))
+
+        runs = []
+        for top in range(0, self.screen_height, 20):
+            shift = math.floor(self.curve * (top / self.screen_height) * 0.5)
+            bottom = min(top + 20, self.screen_height)
+            if runs and runs[-1][2] == shift:
+                runs[-1] = (runs[-1][0], bottom, shift)
+            else:
+                runs.append((top, bottom, shift))
+        return runs
 
     def draw(self, screen):
-        road_rect = pygame.Rect(self.screen_width//2 - ROAD_WIDTH//2, 0, ROAD_WIDTH, self.screen_height)
+        road_rect = pygame.Rect(self.layout.left, 0, self.layout.road_width, self.screen_height)
         pygame.draw.rect(screen, DARK_GRAY, road_rect)
 
-        for y in self.line_positions:
+        for y in range(int(self.line_offset) - self.line_spacing, self.screen_height, self.line_spacing):
             curve_offset = self.curve * (y / self.screen_height) * 0.5
-            line_rect = pygame.Rect(self.screen_width//2 - self.line_width//2 + curve_offset, y,
-                                  self.line_width, self.line_height)
-            pygame.draw.rect(screen, YELLOW, line_rect)
-
-        for y in range(0, self.screen_height, 20):
-            curve_offset = self.curve * (y / self.screen_height) * 0.5
-            left_border = self.screen_width//2 - ROAD_WIDTH//2 - 20 + curve_offset
-            right_border = self.screen_width//2 + ROAD_WIDTH//2 + curve_offset
-
-            pygame.draw.rect(screen, GRAY, (left_border, y, 20, 10))
-            pygame.draw.rect(screen, GRAY, (right_border, y, 20, 10))
-
-        for y in range(0, self.screen_height, 40):
-            curve_offset = self.curve * (y / self.screen_height) * 0.5
-
-            if self.num_lanes == 4:
-                for i in range(1, 4):
-                    divider_x = self.screen_width//2 - ROAD_WIDTH//2 + (ROAD_WIDTH * i) // 4 + curve_offset
-                    pygame.draw.rect(screen, (150, 150, 150, 100), (divider_x - 1, y, 2, 20))
-            elif self.num_lanes == 3:
-                for i in range(1, 3):
-                    divider_x = self.screen_width//2 - ROAD_WIDTH//2 + (ROAD_WIDTH * i) // 3 + curve_offset
-                    pygame.draw.rect(screen, (150, 150, 150, 100), (divider_x - 1, y, 2, 20))
-            else:
-                divider_x = self.screen_width//2 + curve_offset
-                pygame.draw.rect(screen, (150, 150, 150, 100), (divider_x - 1, y, 2, 20))
+            screen.fill(YELLOW, (self.screen_width//2 - self.line_width//2 + curve_offset, y,
+                                 self.line_width, self.line_height))
+
+        key = (self.layout, self.screen_height)
+        if self.markings is None or self.markings[0] != key:
+            self.build_markings()
+            self.marking_runs = None
+        # Long straights and steady curves reuse the last layout until the curve really moves
+        if self.marking_runs is None or self.marking_runs[0] != key or abs(self.marking_runs[1] - self.curve) > ROAD_CURVE_EPSILON:
+            strip = self.markings[1]
+            left = self.layout.left - 20
+            width = strip.get_width()
+            sequence = [(strip, (left + shift, top), (0, top % 40, width, bottom - top))
+                        for top, bottom, shift in self.curve_runs()]
+            self.marking_runs = (key, self.curve, sequence)
+        screen.blits(self.marking_runs[2], doreturn=False)
 
         if self.current_turn != TurnDirection.STRAIGHT and self.turn_intensity > 0.5:
-            warning_font = pygame.font.SysFont('courier', 24, bold=True)
+            warning_font = FONTS.get('courier', 24, bold=True)
             if self.current_turn == TurnDirection.LEFT:
-                warning_text = warning_font.render("← LEFT TURN", True, YELLOW)
+                warning_text = TEXT_CACHE.render(warning_font, "← LEFT TURN", True, YELLOW)
             else:
-                warning_text = warning_font.render("RIGHT TURN →", True, YELLOW)
+                warning_text = TEXT_CACHE.render(warning_font, "RIGHT TURN →", True, YELLOW)
 
             screen.blit(warning_text, (self.screen_width//2 - warning_text.get_width()//2, 50))
 
@@ -679,53 +1593,182 @@ class Road:
     def get_race_progress(self):
         return 0  # Regular road doesn't have race progress
 
+TURN_CODES = {direction.value: direction for direction in TurnDirection}
+
+DEFAULT_TRACK = (
+    (TurnDirection.LEFT, 0.8, 120),
+    (TurnDirection.STRAIGHT, 0, 60),
+    (TurnDirection.RIGHT, 0.9, 100),
+    (TurnDirection.STRAIGHT, 0, 40),
+    (TurnDirection.LEFT, 0.7, 80),
+    (TurnDirection.RIGHT, 0.6, 70),
+    (TurnDirection.STRAIGHT, 0, 50),
+    (TurnDirection.LEFT, 1.0, 150),
+    (TurnDirection.RIGHT, 0.8, 90),
+    (TurnDirection.STRAIGHT, 0, 30),
+    (TurnDirection.LEFT, 0.9, 110),
+    (TurnDirection.RIGHT, 0.7, 85),
+    (TurnDirection.STRAIGHT, 0, 60),
+    (TurnDirection.LEFT, 0.6, 75),
+    (TurnDirection.RIGHT, 1.0, 140),
+)
+
+class Track:
+    # Segments are (direction, intensity, length); starts[i] is the distance at which segment i begins
+    # File layout: header, one start distance per TRACK_INDEX_STRIDE segments, then fixed-width records
+    HEADER = struct.Struct("<4sHHIQ")
+    RECORD = struct.Struct("<BxHI")
+
+    def __init__(self, segments):
+        self.segments = tuple(segments)
+        if not self.segments:
+            raise ValueError("track needs at least one segment")
+        self.starts = (0,) + tuple(accumulate(segment[2] for segment in self.segments))[:-1]
+        self.total_length = self.starts[-1] + self.segments[-1][2]
+        if self.total_length <= 0:
+            raise ValueError("track needs a positive length")
+
+    def __len__(self):
+        return len(self.segments)
+
+    def segment(self, index):
+        return self.segments[index]
+
+    def locate(self, distance):
+        # Returns (segment index, distance into that segment); the track loops past its end
+        distance %= self.total_length
+        index = bisect_right(self.starts, distance) - 1
+        return index, distance - self.starts[index]
+
+    def segment_at(self, distance):
+        return self.segment(self.locate(distance)[0])
+
+    def progress(self, distance):
+        return min(100, distance / self.total_length * 100)
+
+    def save(self, path, stride=TRACK_INDEX_STRIDE):
+        # Goes through segment() so a loaded track can be re-exported block by block
+        index = []
+        records = []
+        distance = 0
+        for i in range(len(self)):
+            if i % stride == 0:
+                index.append(distance)
+            direction, intensity, length = self.segment(i)
+            # The record stores whole-unit lengths and intensity as uint16 thousandths
+            if not isinstance(direction, TurnDirection):
+                raise ValueError(f"segment {i}: direction must be a TurnDirection, got {direction!r}")
+            if not 0 <= intensity <= 65.535:
+                raise ValueError(f"segment {i}: intensity {intensity!r} is outside 0-65.535")
+            if length != int(length) or not 0 <= length <= 0xFFFFFFFF:
+                raise ValueError(f"segment {i}: length {length!r} is not a whole number in the uint32 range")
+            length = int(length)
+            records.append(self.RECORD.pack(direction.value, round(intensity * 1000), length))
+            distance += length
+        records = b"".join(records)
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path + ".tmp", 'wb') as f:
+                f.write(self.HEADER.pack(TRACK_MAGIC, TRACK_VERSION, stride, len(self), distance))
+                f.write(struct.pack(f"<{len(index)}Q", *index))
+                f.write(records)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def load(path):
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        track = MappedTrack(data)
+        if not track.valid:
+            data.close()
+            return None
+        return track
+
+class MappedTrack(Track):
+    # Reads a saved track in place; only the blocks of segments near the car are ever decoded
+    def __init__(self, data):
+        self.data = data
+        self.blocks = OrderedDict()
+        self.valid = False
+        if len(data) < self.HEADER.size:
+            return
+        magic, version, self.stride, self.count, self.total_length = self.HEADER.unpack_from(data)
+        if magic != TRACK_MAGIC or version != TRACK_VERSION or not self.stride or not self.count:
+            return
+        block_count = -(-self.count // self.stride)
+        self.records_offset = self.HEADER.size + block_count * 8
+        if len(data) != self.records_offset + self.count * self.RECORD.size or self.total_length <= 0:
+            return
+        self.block_starts = struct.unpack_from(f"<{block_count}Q", data, self.HEADER.size)
+        # A bad index would send locate() to negative or out-of-range blocks
+        if self.block_starts[0] != 0 or self.total_length <= self.block_starts[-1]:
+            return
+        if any(later < earlier for earlier, later in zip(self.block_starts, self.block_starts[1:])):
+            return
+        self.valid = True
+
+    def __len__(self):
+        return self.count
+
+    def block(self, number):
+        block = self.blocks.get(number)
+        if block is not None:
+            self.blocks.move_to_end(number)
+            return block
+
+        first = number * self.stride
+        count = min(self.stride, self.count - first)
+        offset = self.records_offset + first * self.RECORD.size
+        segments = tuple((TURN_CODES.get(code, TurnDirection.STRAIGHT), intensity / 1000, length)
+                         for code, intensity, length in
+                         self.RECORD.iter_unpack(self.data[offset:offset + count * self.RECORD.size]))
+        starts = tuple(accumulate((segment[2] for segment in segments[:-1]), initial=self.block_starts[number]))
+        block = (starts, segments)
+        self.blocks[number] = block
+        if len(self.blocks) > TRACK_WINDOW_BLOCKS:
+            self.blocks.popitem(last=False)
+        return block
+
+    def segment(self, index):
+        return self.block(index // self.stride)[1][index % self.stride]
+
+    def locate(self, distance):
+        distance %= self.total_length
+        number = bisect_right(self.block_starts, distance) - 1
+        starts, _ = self.block(number)
+        index = bisect_right(starts, distance) - 1
+        return number * self.stride + index, distance - starts[index]
+
 class RaceRoad(Road):
-    def __init__(self, screen_width, screen_height, num_lanes=3):
+    def __init__(self, screen_width, screen_height, num_lanes=3, track_path=None):
         super().__init__(screen_width, screen_height, num_lanes)
         self.turn_sequence = []
         self.current_turn_index = 0
         self.turn_progress = 0
         self.race_distance = 0
-        self.generate_turn_sequence()
+        self.track = Track.load(track_path) if track_path else None
+        if self.track is None:
+            self.generate_turn_sequence()
 
     def generate_turn_sequence(self):
-        turns = [
-            (TurnDirection.LEFT, 0.8, 120),
-            (TurnDirection.STRAIGHT, 0, 60),
-            (TurnDirection.RIGHT, 0.9, 100),
-            (TurnDirection.STRAIGHT, 0, 40),
-            (TurnDirection.LEFT, 0.7, 80),
-            (TurnDirection.RIGHT, 0.6, 70),
-            (TurnDirection.STRAIGHT, 0, 50),
-            (TurnDirection.LEFT, 1.0, 150),
-            (TurnDirection.RIGHT, 0.8, 90),
-            (TurnDirection.STRAIGHT, 0, 30),
-            (TurnDirection.LEFT, 0.9, 110),
-            (TurnDirection.RIGHT, 0.7, 85),
-            (TurnDirection.STRAIGHT, 0, 60),
-            (TurnDirection.LEFT, 0.6, 75),
-            (TurnDirection.RIGHT, 1.0, 140),
-        ]
-        self.turn_sequence = turns
+        self.turn_sequence = list(DEFAULT_TRACK)
+        self.track = Track(self.turn_sequence)
 
     def update(self, speed):
         self.speed = speed
-        self.race_distance += speed
-
-        if self.current_turn_index < len(self.turn_sequence):
-            current_turn = self.turn_sequence[self.current_turn_index]
-            self.current_turn = current_turn[0]
-            self.turn_intensity = current_turn[1]
 
-            self.turn_progress += speed
-            if self.turn_progress >= current_turn[2]:
-                self.turn_progress = 0
-                self.current_turn_index += 1
-                if self.current_turn_index >= len(self.turn_sequence):
-                    self.current_turn_index = 0
-        else:
-            self.current_turn = TurnDirection.STRAIGHT
-            self.turn_intensity = 0
+        self.current_turn_index, _ = self.track.locate(self.race_distance)
+        self.current_turn, self.turn_intensity, _ = self.track.segment(self.current_turn_index)
+        self.race_distance += speed
+        self.turn_progress = self.track.locate(self.race_distance)[1]
 
         if self.current_turn == TurnDirection.LEFT:
             self.curve_target = self.turn_intensity * 150
@@ -736,14 +1779,10 @@ class RaceRoad(Road):
 
         self.curve += (self.curve_target - self.curve) * 0.03
 
-        for i in range(len(self.line_positions)):
-            self.line_positions[i] += speed
-            if self.line_positions[i] > self.screen_height + self.line_height:
-                self.line_positions[i] = -self.line_height
+        self.line_offset = (self.line_offset + speed) % self.line_spacing
 
     def get_race_progress(self):
-        total_distance = sum(turn[2] for turn in self.turn_sequence)
-        return min(100, (self.race_distance / total_distance) * 100)
+        return self.track.progress(self.race_distance)
 
 class RaceBot:
     def __init__(self, car_type, screen_width, screen_height, num_lanes=3):
@@ -755,37 +1794,23 @@ class RaceBot:
         self.screen_height = screen_height
         self.num_lanes = num_lanes
 
-        # Use the same lane positioning as PlayerCar
-        if num_lanes == 4:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + ROAD_WIDTH//8,
-                screen_width//2 - ROAD_WIDTH//4 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//8,
-                screen_width//2 + ROAD_WIDTH//4 + ROAD_WIDTH//8
-            ]
-            self.lane = 2
-        elif num_lanes == 3:
-            lane_spacing = ROAD_WIDTH // 3
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//2 + lane_spacing//2,
-                screen_width//2,
-                screen_width//2 + ROAD_WIDTH//2 - lane_spacing//2
-            ]
-            self.lane = 2
-        else:
-            self.lanes_x = [
-                screen_width//2 - ROAD_WIDTH//4,
-                screen_width//2 + ROAD_WIDTH//4
-            ]
-            self.lane = 1
+        self.layout = LaneLayout.get(screen_width, num_lanes)
+        self.lane = (num_lanes - 1) // 2 + 1
 
-        self.x = self.lanes_x[self.lane]
+        self.x = self.layout.lanes_x[self.lane]
         self.y = screen_height - 200
         self.speed = 8
-        self.target_x = self.lanes_x[self.lane]
+        self.target_x = self.layout.lanes_x[self.lane]
         self.drift_angle = 0
         self.reaction_time = random.uniform(0.1, 0.3)
         self.last_lane_change = 0
+        self.rotation_step = 0
+
+    def update_size(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.layout = LaneLayout.get(screen_width, self.num_lanes)
+        self.target_x = self.layout.lanes_x[self.lane]
 
     def update(self, turn_direction, turn_intensity, player_x, player_speed):
         target_speed = player_speed * 1.1
@@ -800,7 +1825,7 @@ class RaceBot:
                     self.lane -= 1
                 elif self.lane < self.num_lanes - 1:
                     self.lane += 1
-                self.target_x = self.lanes_x[self.lane]
+                self.target_x = self.layout.lanes_x[self.lane]
                 self.last_lane_change = current_time
 
         if turn_direction != TurnDirection.STRAIGHT:
@@ -810,7 +1835,7 @@ class RaceBot:
             else:
                 self.target_x -= turn_factor
 
-            self.target_x = max(self.lanes_x[0], min(self.lanes_x[-1], self.target_x))
+            self.target_x = max(self.layout.lanes_x[0], min(self.layout.lanes_x[-1], self.target_x))
 
         if turn_direction != TurnDirection.STRAIGHT and turn_intensity > 0.5:
             max_drift_angle = 15 * self.stats["drift"]
@@ -820,24 +1845,16 @@ class RaceBot:
             self.drift_angle *= 0.8
 
     def draw(self, screen, turn_direction, turn_intensity):
-        color = self.stats["color"]
         car_rect = pygame.Rect(0, 0, self.width, self.height)
         car_rect.center = (self.x, self.y)
 
-        car_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(car_surface, color, (0, 0, self.width, self.height))
-        pygame.draw.rect(car_surface, BLACK, (0, 0, self.width, self.height), 2)
-
-        pygame.draw.rect(car_surface, YELLOW, (5, 5, 8, 5))
-        pygame.draw.rect(car_surface, YELLOW, (self.width-13, 5, 8, 5))
-
         turn_angle = 0
         if turn_direction != TurnDirection.STRAIGHT:
             turn_angle = turn_intensity * 3 * (1 if turn_direction == TurnDirection.LEFT else -1)
 
         total_angle = self.drift_angle + turn_angle
 
-        rotated_car = pygame.transform.rotate(car_surface, total_angle)
+        rotated_car = CAR_SPRITES.rotated(self.car_type, "traffic", (self.width, self.height), total_angle, self.rotation_step)
         rotated_rect = rotated_car.get_rect(center=car_rect.center)
         screen.blit(rotated_car, rotated_rect)
 
@@ -848,58 +1865,32 @@ class RaceBot:
                              self.width, self.height)
         return player_rect.colliderect(bot_rect)
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-3, 3)
-        self.vy = random.uniform(-2, 0)
-        self.life = 30
-        self.color = color
-        self.size = random.randint(2, 6)
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.vy += 0.1
-
-    def draw(self, screen):
-        alpha = int(255 * (self.life / 30))
-        color_with_alpha = (*self.color, alpha)
-        surf = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.circle(surf, color_with_alpha, (self.size//2, self.size//2), self.size//2)
-        screen.blit(surf, (int(self.x), int(self.y)))
-
-    def is_dead(self):
-        return self.life <= 0
-
 class NameInput:
     def __init__(self, leaderboard):
         self.name = ""
         self.active = True
         self.leaderboard = leaderboard
         self.error_message = ""
-        self.font_large = pygame.font.SysFont('courier', 36, bold=True)
-        self.font_medium = pygame.font.SysFont('courier', 24, bold=True)
-        self.font_small = pygame.font.SysFont('courier', 18)
+        self.font_large = FONTS.get('courier', 36, bold=True)
+        self.font_medium = FONTS.get('courier', 24, bold=True)
+        self.font_small = FONTS.get('courier', 18)
 
-    def draw(self, screen, crt, car_type):
+    def draw(self, screen, car_type):
         screen_width, screen_height = screen.get_size()
         screen.fill(BLACK)
 
-        title = self.font_large.render("ENTER YOUR NAME", True, YELLOW)
+        title = TEXT_CACHE.render(self.font_large, "ENTER YOUR NAME", True, YELLOW)
         screen.blit(title, (screen_width//2 - title.get_width()//2, 100))
 
         car = car_type.value
-        car_text = self.font_medium.render(f"Selected: {car['name']}", True, car["color"])
+        car_text = TEXT_CACHE.render(self.font_medium, f"Selected: {car['name']}", True, car["color"])
         screen.blit(car_text, (screen_width//2 - car_text.get_width()//2, 160))
 
         input_rect = pygame.Rect(screen_width//2 - 150, 220, 300, 50)
         pygame.draw.rect(screen, DARK_GRAY, input_rect)
         pygame.draw.rect(screen, WHITE, input_rect, 2)
 
-        name_text = self.font_medium.render(self.name, True, WHITE)
+        name_text = TEXT_CACHE.render(self.font_medium, self.name, True, WHITE)
         screen.blit(name_text, (input_rect.x + 10, input_rect.y + 10))
 
         if self.active and pygame.time.get_ticks() % 1000 < 500:
@@ -908,17 +1899,18 @@ class NameInput:
                            (cursor_x, input_rect.y + 40), 2)
 
         if self.error_message:
-            error_text = self.font_small.render(self.error_message, True, RED)
+            error_text = TEXT_CACHE.render(self.font_small, self.error_message, True, RED)
             screen.blit(error_text, (screen_width//2 - error_text.get_width()//2, 290))
 
-        hint1 = self.font_small.render("Press ENTER to start racing", True, GREEN)
-        hint2 = self.font_small.render("Press ESC to go back", True, GRAY)
+        hint1 = TEXT_CACHE.render(self.font_small, "Press ENTER to start racing", True, GREEN)
+        hint2 = TEXT_CACHE.render(self.font_small, "Press ESC to go back", True, GRAY)
 
         screen.blit(hint1, (screen_width//2 - hint1.get_width()//2, 330))
         screen.blit(hint2, (screen_width//2 - hint2.get_width()//2, 360))
 
-        crt.draw()
-        pygame.display.flip()
+    def view_key(self, car_type):
+        cursor_visible = self.active and pygame.time.get_ticks() % 1000 < 500
+        return (self.name, self.error_message, car_type, cursor_visible)
 
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -948,32 +1940,32 @@ class LeaderboardScreen:
         self.leaderboard = leaderboard
         self.selected_filter = 0
         self.filters = ["ALL CARS", "AE86", "RX-7", "GTR", "EVO", "SUPRA"]
-        self.font_large = pygame.font.SysFont('courier', 36, bold=True)
-        self.font_medium = pygame.font.SysFont('courier', 24, bold=True)
-        self.font_small = pygame.font.SysFont('courier', 18)
+        self.font_large = FONTS.get('courier', 36, bold=True)
+        self.font_medium = FONTS.get('courier', 24, bold=True)
+        self.font_small = FONTS.get('courier', 18)
         self.start_index = 0
         self.entries_per_page = 8
 
-    def draw(self, screen, crt):
+    def draw(self, screen):
         screen_width, screen_height = screen.get_size()
         screen.fill(BLACK)
 
-        title = self.font_large.render("LEADERBOARD", True, YELLOW)
+        title = TEXT_CACHE.render(self.font_large, "LEADERBOARD", True, YELLOW)
         screen.blit(title, (screen_width//2 - title.get_width()//2, 50))
 
-        filter_text = self.font_medium.render("FILTER:", True, WHITE)
+        filter_text = TEXT_CACHE.render(self.font_medium, "FILTER:", True, WHITE)
         screen.blit(filter_text, (50, 110))
 
         for i, filter_name in enumerate(self.filters):
             color = YELLOW if i == self.selected_filter else WHITE
-            filter_btn = self.font_small.render(filter_name, True, color)
+            filter_btn = TEXT_CACHE.render(self.font_small, filter_name, True, color)
             screen.blit(filter_btn, (150 + i * 80, 110))
 
         headers = ["RANK", "NAME", "SCORE", "DRIFT", "CAR", "DATE"]
         header_x = [50, 120, 250, 350, 450, 550]
 
         for i, header in enumerate(headers):
-            header_text = self.font_small.render(header, True, GREEN)
+            header_text = TEXT_CACHE.render(self.font_small, header, True, GREEN)
             screen.blit(header_text, (header_x[i], 150))
 
         car_filter = None
@@ -986,31 +1978,31 @@ class LeaderboardScreen:
         for i in range(self.start_index, min(self.start_index + self.entries_per_page, len(entries))):
             entry = entries[i]
 
-            rank_text = self.font_small.render(f"{i+1}.", True, WHITE)
+            rank_text = TEXT_CACHE.render(self.font_small, f"{i+1}.", True, WHITE)
             screen.blit(rank_text, (header_x[0], y_pos))
 
             name = entry['name'][:10] + "..." if len(entry['name']) > 10 else entry['name']
-            name_text = self.font_small.render(name, True, WHITE)
+            name_text = TEXT_CACHE.render(self.font_small, name, True, WHITE)
             screen.blit(name_text, (header_x[1], y_pos))
 
-            score_text = self.font_small.render(str(entry['score']), True, YELLOW)
+            score_text = TEXT_CACHE.render(self.font_small, str(entry['score']), True, YELLOW)
             screen.blit(score_text, (header_x[2], y_pos))
 
-            drift_text = self.font_small.render(str(entry['drift_score']), True, GREEN)
+            drift_text = TEXT_CACHE.render(self.font_small, str(entry['drift_score']), True, GREEN)
             screen.blit(drift_text, (header_x[3], y_pos))
 
-            car_text = self.font_small.render(entry['car_type'], True, self.get_car_color(entry['car_type']))
+            car_text = TEXT_CACHE.render(self.font_small, entry['car_type'], True, self.get_car_color(entry['car_type']))
             screen.blit(car_text, (header_x[4], y_pos))
 
             date = entry['date'].split()[0]
-            date_text = self.font_small.render(date, True, GRAY)
+            date_text = TEXT_CACHE.render(self.font_small, date, True, GRAY)
             screen.blit(date_text, (header_x[5], y_pos))
 
             y_pos += 30
 
         if len(entries) > self.entries_per_page:
             page_info = f"PAGE {self.start_index // self.entries_per_page + 1}/{(len(entries) - 1) // self.entries_per_page + 1}"
-            page_text = self.font_small.render(page_info, True, WHITE)
+            page_text = TEXT_CACHE.render(self.font_small, page_info, True, WHITE)
             screen.blit(page_text, (screen_width//2 - page_text.get_width()//2, screen_height - 80))
 
         controls = [
@@ -1020,11 +2012,11 @@ class LeaderboardScreen:
         ]
 
         for i, control in enumerate(controls):
-            control_text = self.font_small.render(control, True, GRAY)
+            control_text = TEXT_CACHE.render(self.font_small, control, True, GRAY)
             screen.blit(control_text, (screen_width//2 - control_text.get_width()//2, screen_height - 40 + i * 20))
 
-        crt.draw()
-        pygame.display.flip()
+    def view_key(self):
+        return (self.selected_filter, self.start_index)
 
     def get_car_color(self, car_name):
         for car_type in CarType:
@@ -1052,39 +2044,41 @@ class LeaderboardScreen:
 class SettingsScreen:
     def __init__(self):
         self.selected_option = 0
-        self.options = ["2 LANES", "3 LANES", "4 LANES", "INSANE MODE: OFF", "RACE MODE: OFF", "BACK"]
-        self.font_large = pygame.font.SysFont('courier', 36, bold=True)
-        self.font_medium = pygame.font.SysFont('courier', 24, bold=True)
-        self.font_small = pygame.font.SysFont('courier', 18)
+        self.lane_options = [2, 3, 4, 6, 8]
+        self.options = [f"{lanes} LANES" for lanes in self.lane_options] + ["INSANE MODE: OFF", "RACE MODE: OFF", "BACK"]
+        self.font_large = FONTS.get('courier', 36, bold=True)
+        self.font_medium = FONTS.get('courier', 24, bold=True)
+        self.font_small = FONTS.get('courier', 18)
 
-    def draw(self, screen, crt, current_lanes, insane_mode, race_mode):
+    def draw(self, screen, current_lanes, insane_mode, race_mode):
         screen_width, screen_height = screen.get_size()
         screen.fill(BLACK)
 
-        title = self.font_large.render("SETTINGS", True, YELLOW)
+        title = TEXT_CACHE.render(self.font_large, "SETTINGS", True, YELLOW)
         screen.blit(title, (screen_width//2 - title.get_width()//2, 100))
 
-        lanes_text = self.font_medium.render(f"Current: {current_lanes} LANES", True, GREEN)
+        lanes_text = TEXT_CACHE.render(self.font_medium, f"Current: {current_lanes} LANES", True, GREEN)
         screen.blit(lanes_text, (screen_width//2 - lanes_text.get_width()//2, 160))
 
-        insane_text = self.font_medium.render(f"Insane Mode: {'ON' if insane_mode else 'OFF'}",
-                                            True, RED if insane_mode else GREEN)
+        insane_text = TEXT_CACHE.render(self.font_medium, f"Insane Mode: {'ON' if insane_mode else 'OFF'}",
+                                        True, RED if insane_mode else GREEN)
         screen.blit(insane_text, (screen_width//2 - insane_text.get_width()//2, 190))
 
-        race_text = self.font_medium.render(f"Race Mode: {'ON' if race_mode else 'OFF'}",
-                                          True, CYAN if race_mode else GRAY)
+        race_text = TEXT_CACHE.render(self.font_medium, f"Race Mode: {'ON' if race_mode else 'OFF'}",
+                                      True, CYAN if race_mode else GRAY)
         screen.blit(race_text, (screen_width//2 - race_text.get_width()//2, 220))
 
         for i, option in enumerate(self.options):
             color = YELLOW if i == self.selected_option else WHITE
 
-            if i == 3:
+            toggle = i - len(self.lane_options)
+            if toggle == 0:
                 option = "INSANE MODE: ON" if insane_mode else "INSANE MODE: OFF"
-            elif i == 4:
+            elif toggle == 1:
                 option = "RACE MODE: ON" if race_mode else "RACE MODE: OFF"
 
-            text = self.font_medium.render(option, True, color)
-            screen.blit(text, (screen_width//2 - text.get_width()//2, 280 + i * 50))
+            text = TEXT_CACHE.render(self.font_medium, option, True, color)
+            screen.blit(text, (screen_width//2 - text.get_width()//2, 260 + i * 30))
 
         controls = [
             "↑↓: Navigate",
@@ -1093,11 +2087,11 @@ class SettingsScreen:
         ]
 
         for i, control in enumerate(controls):
-            text = self.font_small.render(control, True, GRAY)
+            text = TEXT_CACHE.render(self.font_small, control, True, GRAY)
             screen.blit(text, (screen_width//2 - text.get_width()//2, screen_height - 100 + i * 30))
 
-        crt.draw()
-        pygame.display.flip()
+    def view_key(self, current_lanes, insane_mode, race_mode):
+        return (self.selected_option, current_lanes, insane_mode, race_mode)
 
     def handle_input(self, event, current_lanes, insane_mode, race_mode):
         if event.type == pygame.KEYDOWN:
@@ -1106,17 +2100,14 @@ class SettingsScreen:
             elif event.key == pygame.K_DOWN:
                 self.selected_option = (self.selected_option + 1) % len(self.options)
             elif event.key == pygame.K_RETURN:
-                if self.selected_option == 0:
-                    return 2, insane_mode, race_mode
-                elif self.selected_option == 1:
-                    return 3, insane_mode, race_mode
-                elif self.selected_option == 2:
-                    return 4, insane_mode, race_mode
-                elif self.selected_option == 3:
+                toggle = self.selected_option - len(self.lane_options)
+                if toggle < 0:
+                    return self.lane_options[self.selected_option], insane_mode, race_mode
+                elif toggle == 0:
                     return current_lanes, not insane_mode, race_mode
-                elif self.selected_option == 4:
+                elif toggle == 1:
                     return current_lanes, insane_mode, not race_mode
-                elif self.selected_option == 5:
+                elif toggle == 2:
                     return "BACK", insane_mode, race_mode
         return current_lanes, insane_mode, race_mode
 
@@ -1124,23 +2115,23 @@ class Menu:
     def __init__(self):
         self.selected_option = 0
         self.options = ["START GAME", "CAR SELECT", "LEADERBOARD", "SETTINGS", "QUIT"]
-        self.font_large = pygame.font.SysFont('courier', 48, bold=True)
-        self.font_medium = pygame.font.SysFont('courier', 36, bold=True)
-        self.font_small = pygame.font.SysFont('courier', 24)
+        self.font_large = FONTS.get('courier', 48, bold=True)
+        self.font_medium = FONTS.get('courier', 36, bold=True)
+        self.font_small = FONTS.get('courier', 24)
 
-    def draw(self, screen, crt):
+    def draw(self, screen):
         screen_width, screen_height = screen.get_size()
         screen.fill(BLACK)
 
-        title = self.font_large.render("INITIAL D", True, RED)
-        subtitle = self.font_medium.render("RETRO ARCADE", True, WHITE)
+        title = TEXT_CACHE.render(self.font_large, "INITIAL D", True, RED)
+        subtitle = TEXT_CACHE.render(self.font_medium, "RETRO ARCADE", True, WHITE)
 
         screen.blit(title, (screen_width//2 - title.get_width()//2, 100))
         screen.blit(subtitle, (screen_width//2 - subtitle.get_width()//2, 160))
 
         for i, option in enumerate(self.options):
             color = YELLOW if i == self.selected_option else WHITE
-            text = self.font_medium.render(option, True, color)
+            text = TEXT_CACHE.render(self.font_medium, option, True, color)
             screen.blit(text, (screen_width//2 - text.get_width()//2, 250 + i * 60))
 
         controls = [
@@ -1150,11 +2141,11 @@ class Menu:
         ]
 
         for i, control in enumerate(controls):
-            text = self.font_small.render(control, True, GRAY)
+            text = TEXT_CACHE.render(self.font_small, control, True, GRAY)
             screen.blit(text, (screen_width//2 - text.get_width()//2, screen_height - 100 + i * 30))
 
-        crt.draw()
-        pygame.display.flip()
+    def view_key(self):
+        return self.selected_option
 
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -1170,38 +2161,31 @@ class CarSelection:
     def __init__(self):
         self.selected_car = 0
         self.cars = list(CarType)
-        self.font_large = pygame.font.SysFont('courier', 36, bold=True)
-        self.font_medium = pygame.font.SysFont('courier', 24, bold=True)
-        self.font_small = pygame.font.SysFont('courier', 18)
+        self.font_large = FONTS.get('courier', 36, bold=True)
+        self.font_medium = FONTS.get('courier', 24, bold=True)
+        self.font_small = FONTS.get('courier', 18)
 
-    def draw(self, screen, crt):
+    def draw(self, screen):
         screen_width, screen_height = screen.get_size()
         screen.fill(BLACK)
 
-        title = self.font_large.render("SELECT YOUR CAR", True, YELLOW)
+        title = TEXT_CACHE.render(self.font_large, "SELECT YOUR CAR", True, YELLOW)
         screen.blit(title, (screen_width//2 - title.get_width()//2, 50))
 
         for i, car_type in enumerate(self.cars):
             car = car_type.value
             color = YELLOW if i == self.selected_car else WHITE
 
-            name_text = self.font_medium.render(car["name"], True, color)
+            name_text = TEXT_CACHE.render(self.font_medium, car["name"], True, color)
             screen.blit(name_text, (screen_width//2 - name_text.get_width()//2, 150 + i * 100))
 
-            stats_text = self.font_small.render(
+            stats_text = TEXT_CACHE.render(self.font_small,
                 f"Speed: {car['max_speed']} | Handling: {car['handling']} | Drift: {car['drift']}",
                 True, car["color"]
             )
             screen.blit(stats_text, (screen_width//2 - stats_text.get_width()//2, 180 + i * 100))
 
-            car_rect = pygame.Rect(screen_width//2 - 20, 210 + i * 100, 40, 70)
-            pygame.draw.rect(screen, car["color"], car_rect)
-            pygame.draw.rect(screen, BLACK, car_rect, 2)
-
-            pygame.draw.rect(screen, YELLOW, (screen_width//2 - 15, 215 + i * 100, 8, 5))
-            pygame.draw.rect(screen, YELLOW, (screen_width//2 + 7, 215 + i * 100, 8, 5))
-            pygame.draw.rect(screen, RED, (screen_width//2 - 15, 265 + i * 100, 8, 5))
-            pygame.draw.rect(screen, RED, (screen_width//2 + 7, 265 + i * 100, 8, 5))
+            screen.blit(CAR_SPRITES.get(car_type, "preview"), (screen_width//2 - 20, 210 + i * 100))
 
         controls = [
             "↑↓: Select Car",
@@ -1210,11 +2194,11 @@ class CarSelection:
         ]
 
         for i, control in enumerate(controls):
-            text = self.font_small.render(control, True, GRAY)
+            text = TEXT_CACHE.render(self.font_small, control, True, GRAY)
             screen.blit(text, (screen_width//2 - text.get_width()//2, screen_height - 100 + i * 25))
 
-        crt.draw()
-        pygame.display.flip()
+    def view_key(self):
+        return self.selected_car
 
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -1230,13 +2214,26 @@ class CarSelection:
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((INITIAL_WIDTH, INITIAL_HEIGHT), pygame.RESIZABLE)
+        self.display = pygame.display.set_mode((INITIAL_WIDTH, INITIAL_HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("Initial D: Retro Arcade")
         self.clock = pygame.time.Clock()
-        self.crt = CRT(self.screen)
-        self.font_large = pygame.font.SysFont('courier', 36, bold=True)
-        self.font_medium = pygame.font.SysFont('courier', 24, bold=True)
-        self.font_small = pygame.font.SysFont('courier', 18)
+        self.config = GraphicsConfig()
+        self.screen = self.display
+        self.setup_render_target()
+        self.crt = CRT(self.screen, self.crt_size())
+        self.postfx = PostFX(self.config.get("postfx"))
+        self.postfx.add_stage("bloom", BloomEffect().apply)
+        self.postfx.add_stage("aberration", ChromaticAberrationEffect().apply, available=np is not None)
+        self.postfx.add_stage("crt", self.draw_crt)
+        self.show_debug = False
+        self.paletted = PalettedPlayfield() if self.config.get("palette_mode") else None
+        self.governor = QualityGovernor() if self.config.get("quality_governor") else None
+        self.overlays = OverlayManager()
+        self.bitmap_fonts = {}
+        self.render_queue = RenderQueue(("traffic", "bot", "explosions", "player"))
+        self.font_large = FONTS.get('courier', 36, bold=True)
+        self.font_medium = FONTS.get('courier', 24, bold=True)
+        self.font_small = FONTS.get('courier', 18)
         self.leaderboard = Leaderboard()
         self.state = GameState.MENU
         self.menu = Menu()
@@ -1250,6 +2247,11 @@ class Game:
         self.insane_mode = False
         self.race_mode = False
         self.music_playing = False
+        self.pending_size = None
+        self.resize_deadline = 0
+        self.presented_key = None
+        self.enemies = EntityPool(EnemyCar, ENEMY_POOL_SIZE)
+        self.particles = ParticleSystem()
         self.load_music()
         self.reset_game()
 
@@ -1271,24 +2273,54 @@ class Game:
         screen_width, screen_height = self.screen.get_size()
         if self.race_mode:
             self.player = PlayerCar(self.selected_car, screen_width, screen_height, self.num_lanes, self.insane_mode)
-            self.road = RaceRoad(screen_width, screen_height, self.num_lanes)
+            self.road = RaceRoad(screen_width, screen_height, self.num_lanes, self.config.get("race_track"))
             self.bot = RaceBot(random.choice(list(CarType)), screen_width, screen_height, self.num_lanes)
-            self.enemies = []
             self.race_finished = False
             self.race_time = 0
             self.bot_finished = False
         else:
             self.player = PlayerCar(self.selected_car, screen_width, screen_height, self.num_lanes, self.insane_mode)
             self.road = Road(screen_width, screen_height, self.num_lanes)
-            self.enemies = []
 
-        self.particles = []
+        self.enemies.release_all()
+        if self.config.get("skid_marks"):
+            self.player.drift_effect.skid_marks = SkidMarkLayer()
+        self.particles.clear()
         self.spawn_timer = 0
         self.game_over = False
+        self.apply_quality()
+
+        # Every tilt the physics can produce: full drift plus the lean into a turn
+        step = self.rotation_step()
+        CAR_SPRITES.prewarm(self.selected_car, "player", 25 * self.selected_car.value["drift"] + 2.5, step)
+        for car_type in CarType:
+            CAR_SPRITES.prewarm(car_type, "traffic", 15 * car_type.value["drift"] + 3, step)
+
+    def quality(self):
+        return self.governor.quality if self.governor is not None else QualityGovernor.TIERS[0]
+
+    def rotation_step(self):
+        # The governor coarsens rotations on slow machines, otherwise the configured cache step is used
+        return self.quality()["rotation_step"] or self.config.get("rotation_step")
+
+    def apply_quality(self):
+        quality = self.quality()
+        step = self.rotation_step()
+        self.crt.set_compact(CRT_COMPACT or quality["crt"] != "full")
+        self.postfx.suppressed = set(quality["postfx_off"])
+        if not hasattr(self, 'player'):
+            return
+        self.player.drift_effect.max_particles = quality["max_particles"]
+        self.player.drift_effect.trail_every = quality["trail_every"]
+        self.player.rotation_step = step
+        for enemy in self.enemies:
+            enemy.rotation_step = step
+        if self.race_mode and hasattr(self, 'bot'):
+            self.bot.rotation_step = step
 
     def update_sizes(self):
         screen_width, screen_height = self.screen.get_size()
-        self.crt.update_effects((screen_width, screen_height))
+        self.crt.request_effects(self.crt_size())
 
         if hasattr(self, 'player'):
             self.player.update_size(screen_width, screen_height)
@@ -1298,17 +2330,26 @@ class Game:
                 enemy.update_size(screen_width, screen_height)
 
             if self.race_mode and hasattr(self, 'bot'):
-                self.bot.screen_width = screen_width
-                self.bot.screen_height = screen_height
+                self.bot.update_size(screen_width, screen_height)
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
 
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, CRT_READY_EVENT):
+                self.presented_key = None
+
+            if event.type == pygame.KEYDOWN and event.key in DEBUG_KEYS:
+                self.handle_debug_key(event.key)
+                continue
+
             if event.type == pygame.VIDEORESIZE:
-                self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-                self.update_sizes()
+                # Only the last size of a drag burst is applied, see apply_pending_resize
+                self.pending_size = (event.w, event.h)
+                self.resize_deadline = pygame.time.get_ticks() + RESIZE_DEBOUNCE_MS
 
             if self.state == GameState.MENU:
                 result = self.menu.handle_input(event)
@@ -1354,11 +2395,11 @@ class Game:
                     if event.key == pygame.K_LEFT:
                         if self.player.lane > 0:
                             self.player.lane -= 1
-                            self.player.target_x = self.player.lanes_x[self.player.lane]
+                            self.player.target_x = self.player.layout.lanes_x[self.player.lane]
                     elif event.key == pygame.K_RIGHT:
                         if self.player.lane < self.player.num_lanes - 1:
                             self.player.lane += 1
-                            self.player.target_x = self.player.lanes_x[self.player.lane]
+                            self.player.target_x = self.player.layout.lanes_x[self.player.lane]
                     elif event.key == pygame.K_ESCAPE:
                         self.state = GameState.PAUSED
                     elif event.key == pygame.K_r and self.game_over:
@@ -1413,8 +2454,77 @@ class Game:
                         self.insane_mode = new_insane
                         self.race_mode = new_race
 
+        self.apply_pending_resize()
         return True
 
+    def handle_debug_key(self, key):
+        self.presented_key = None
+        if key == pygame.K_F3:
+            self.show_debug = not self.show_debug
+        elif key == pygame.K_F9:
+            self.config.set("palette_mode", not self.config.get("palette_mode"))
+            self.paletted = PalettedPlayfield() if self.config.get("palette_mode") else None
+        elif key == pygame.K_F8:
+            self.config.set("retro_resolution", not self.config.get("retro_resolution"))
+            self.setup_render_target()
+            self.update_sizes()
+        else:
+            self.postfx.toggle(DEBUG_KEYS[key])
+            self.config.save()
+
+    def setup_render_target(self):
+        if self.config.get("retro_resolution"):
+            size = tuple(self.config.get("retro_size"))
+            if self.screen is self.display or self.screen.get_size() != size:
+                self.screen = pygame.Surface(size, 0, self.display)
+            self.crt_on_display = self.config.get("retro_crt_on_display")
+        else:
+            self.screen = self.display
+            self.crt_on_display = False
+        self.update_viewport()
+
+    def update_viewport(self):
+        self.viewport_for = self.display.get_size()
+        if self.screen is self.display:
+            self.viewport = self.display.get_rect()
+            return
+
+        display_width, display_height = self.viewport_for
+        logical_width, logical_height = self.screen.get_size()
+        scale = min(display_width / logical_width, display_height / logical_height)
+        if scale >= 1 and self.config.get("retro_integer_scale"):
+            scale = int(scale)
+        width = max(1, int(logical_width * scale))
+        height = max(1, int(logical_height * scale))
+        self.viewport = pygame.Rect((display_width - width) // 2, (display_height - height) // 2, width, height)
+        self.display.fill(BLACK)
+
+    def crt_size(self):
+        return self.viewport.size if self.crt_on_display else self.screen.get_size()
+
+    def apply_pending_resize(self):
+        if self.pending_size is None or pygame.time.get_ticks() < self.resize_deadline:
+            return
+        self.display = pygame.display.set_mode(self.pending_size, pygame.RESIZABLE)
+        self.pending_size = None
+        if self.screen is not self.display and not self.config.get("retro_resolution"):
+            self.screen = self.display
+        self.update_viewport()
+        self.update_sizes()
+        self.presented_key = None
+
+    def wait_for_events(self):
+        # Menus only change on input, so sleep until something happens instead of spinning at FPS
+        timeout = MENU_IDLE_TIMEOUT_MS
+        if self.state == GameState.NAME_INPUT:
+            timeout = 500 - pygame.time.get_ticks() % 500
+        if self.pending_size is not None:
+            timeout = min(timeout, max(0, self.resize_deadline - pygame.time.get_ticks()))
+        event = pygame.event.wait(max(1, timeout))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
     def update(self):
         if (self.state != GameState.PLAYING and self.state != GameState.RACE_MODE) or self.game_over:
             return
@@ -1448,12 +2558,16 @@ class Game:
                 self.spawn_timer = 0
                 screen_width, screen_height = self.screen.get_size()
                 if len(self.enemies) < 5 + self.player.score // 500:
-                    self.enemies.append(EnemyCar(self.player.speed, self.road.current_turn, self.road.turn_intensity,
-                                               screen_width, screen_height, self.num_lanes, self.insane_mode))
-
-        for enemy in self.enemies[:]:
+                    enemy = self.enemies.acquire(self.player.speed, self.road.current_turn, self.road.turn_intensity,
+                                                 screen_width, screen_height, self.num_lanes, self.insane_mode)
+                    enemy.rotation_step = self.rotation_step()
+
+        # Backwards, so a swap-removed slot is always filled by an enemy that was already updated
+        active = self.enemies.active
+        for i in range(len(active) - 1, -1, -1):
+            enemy = active[i]
             if enemy.update(self.player.speed, self.road.current_turn, self.road.turn_intensity):
-                self.enemies.remove(enemy)
+                self.enemies.release(enemy)
             elif enemy.check_collision(self.player):
                 self.create_explosion(self.player.x, self.player.y)
                 self.game_over = True
@@ -1470,74 +2584,73 @@ class Game:
             self.game_over = True
             self.state = GameState.GAME_OVER
 
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.is_dead():
-                self.particles.remove(particle)
+        self.particles.update()
 
         if not self.race_mode:
             self.player.score += int(self.player.speed * 0.05)
 
     def create_explosion(self, x, y):
-        for _ in range(30):
-            color = random.choice([RED, YELLOW, (255, 100, 0)])
-            self.particles.append(Particle(x, y, color))
+        self.particles.burst(x, y, 30, [RED, YELLOW, (255, 100, 0)], (-3, 3), (-2, 0), (2, 6), 30, gravity=0.1)
+
+    def draw_counter(self, font, text, color, pos):
+        # For HUD values that change nearly every frame, where caching the rendered string doesn't help
+        if not self.config.get("bitmap_counters"):
+            self.screen.blit(TEXT_CACHE.render(font, text, True, color), pos)
+            return
+        key = (font, color)
+        if key not in self.bitmap_fonts:
+            self.bitmap_fonts[key] = BitmapFont(font, color)
+        self.bitmap_fonts[key].draw(self.screen, text, pos)
 
     def draw_hud(self):
         screen_width, screen_height = self.screen.get_size()
 
-        name_text = self.font_small.render(f"DRIVER: {self.player_name}", True, WHITE)
+        name_text = TEXT_CACHE.render(self.font_small, f"DRIVER: {self.player_name}", True, WHITE)
         self.screen.blit(name_text, (20, 20))
 
-        speed_text = self.font_medium.render(f"SPEED: {int(self.player.speed * 20)} km/h", True, WHITE)
-        self.screen.blit(speed_text, (20, 50))
+        self.draw_counter(self.font_medium, f"SPEED: {int(self.player.speed * 20)} km/h", WHITE, (20, 50))
 
         if self.race_mode:
-            time_text = self.font_medium.render(f"TIME: {pygame.time.get_ticks() // 1000}s", True, CYAN)
-            self.screen.blit(time_text, (20, 80))
+            self.draw_counter(self.font_medium, f"TIME: {pygame.time.get_ticks() // 1000}s", CYAN, (20, 80))
 
             # FIXED: Now all road types have get_race_progress method
             progress = self.road.get_race_progress()
-            progress_text = self.font_medium.render(f"RACE: {progress:.1f}%", True, GREEN)
-            self.screen.blit(progress_text, (20, 110))
+            self.draw_counter(self.font_medium, f"RACE: {progress:.1f}%", GREEN, (20, 110))
 
             if hasattr(self, 'bot'):
                 if self.player.y < self.bot.y:
-                    position_text = self.font_medium.render("POSITION: 1st", True, YELLOW)
+                    position_text = TEXT_CACHE.render(self.font_medium, "POSITION: 1st", True, YELLOW)
                 else:
-                    position_text = self.font_medium.render("POSITION: 2nd", True, ORANGE)
+                    position_text = TEXT_CACHE.render(self.font_medium, "POSITION: 2nd", True, ORANGE)
                 self.screen.blit(position_text, (20, 140))
         else:
-            score_text = self.font_medium.render(f"SCORE: {self.player.score}", True, WHITE)
-            self.screen.blit(score_text, (20, 80))
+            self.draw_counter(self.font_medium, f"SCORE: {self.player.score}", WHITE, (20, 80))
 
         if self.player.combo > 1:
-            combo_text = self.font_medium.render(f"COMBO: x{self.player.combo}", True, YELLOW)
-            self.screen.blit(combo_text, (20, 110))
+            self.draw_counter(self.font_medium, f"COMBO: x{self.player.combo}", YELLOW, (20, 110))
 
         if self.player.drift_power > 10 or self.player.drift_combo > 0:
             drift_color = GREEN if self.player.drift_bonus_active else GRAY
-            drift_text = self.font_small.render(f"DRIFT: {self.player.drift_score}", True, drift_color)
-            self.screen.blit(drift_text, (20, 140))
+            self.draw_counter(self.font_small, f"DRIFT: {self.player.drift_score}", drift_color, (20, 140))
 
             if self.player.drift_combo > 0:
-                combo_text = self.font_small.render(f"DRIFT COMBO: x{self.player.drift_combo}", True, YELLOW)
-                self.screen.blit(combo_text, (20, 160))
+                self.draw_counter(self.font_small, f"DRIFT COMBO: x{self.player.drift_combo}", YELLOW, (20, 160))
 
                 if self.player.max_drift_combo > 5:
-                    max_combo_text = self.font_small.render(f"MAX COMBO: {self.player.max_drift_combo}", True, PINK)
-                    self.screen.blit(max_combo_text, (20, 180))
+                    self.draw_counter(self.font_small, f"MAX COMBO: {self.player.max_drift_combo}", PINK, (20, 180))
 
             if not self.player.drift_bonus_active and self.player.is_drifting:
-                hint_text = self.font_small.render("DRIFT IN TURNS FOR BONUS!", True, YELLOW)
+                hint_text = TEXT_CACHE.render(self.font_small, "DRIFT IN TURNS FOR BONUS!", True, YELLOW)
                 self.screen.blit(hint_text, (screen_width//2 - hint_text.get_width()//2, 160))
 
         if self.num_lanes == 4:
             lane_names = ["FAR LEFT", "LEFT", "RIGHT", "FAR RIGHT"]
         elif self.num_lanes == 3:
             lane_names = ["LEFT", "CENTER", "RIGHT"]
-        else:
+        elif self.num_lanes == 2:
             lane_names = ["LEFT", "RIGHT"]
+        else:
+            lane_names = [f"{i + 1}/{self.num_lanes}" for i in range(self.num_lanes)]
 
         # FIXED: Added bounds checking for player lane
         if self.player.lane < 0:
@@ -1545,18 +2658,18 @@ class Game:
         elif self.player.lane >= len(lane_names):
             self.player.lane = len(lane_names) - 1
 
-        lane_text = self.font_small.render(f"LANE: {lane_names[self.player.lane]}", True, GREEN)
+        lane_text = TEXT_CACHE.render(self.font_small, f"LANE: {lane_names[self.player.lane]}", True, GREEN)
         self.screen.blit(lane_text, (screen_width - 150, 80))
 
         if self.insane_mode:
-            insane_text = self.font_small.render("INSANE MODE!", True, RED)
+            insane_text = TEXT_CACHE.render(self.font_small, "INSANE MODE!", True, RED)
             self.screen.blit(insane_text, (screen_width - 150, 110))
 
         if self.race_mode:
-            race_text = self.font_small.render("RACE MODE!", True, CYAN)
+            race_text = TEXT_CACHE.render(self.font_small, "RACE MODE!", True, CYAN)
             self.screen.blit(race_text, (screen_width - 150, 140))
 
-        nitro_text = self.font_small.render("NITRO", True, WHITE)
+        nitro_text = TEXT_CACHE.render(self.font_small, "NITRO", True, WHITE)
         self.screen.blit(nitro_text, (screen_width - 100, 20))
         pygame.draw.rect(self.screen, DARK_GRAY, (screen_width - 100, 45, 80, 15))
         pygame.draw.rect(self.screen, BLUE, (screen_width - 100, 45, 80 * (self.player.nitro / 100), 15))
@@ -1570,99 +2683,203 @@ class Game:
         ]
 
         for i, text in enumerate(controls_text):
-            control_surf = self.font_small.render(text, True, GRAY)
+            control_surf = TEXT_CACHE.render(self.font_small, text, True, GRAY)
             self.screen.blit(control_surf, (screen_width - 150, screen_height - 120 + i * 20))
 
     def draw_playing(self):
-        self.screen.fill(BLACK)
-        self.road.draw(self.screen)
-
+        playfield = self.screen
+        if self.paletted is not None:
+            playfield = self.paletted.begin(self.screen.get_size())
+
+        playfield.fill(BLACK)
+        self.road.draw(playfield)
+        # Tire marks lie on the asphalt, under the traffic
+        if self.player.drift_effect.skid_marks is not None:
+            self.player.drift_effect.skid_marks.draw(playfield)
+
+        queue = self.render_queue
+        queue.begin(playfield)
         for enemy in self.enemies:
-            enemy.draw(self.screen, self.road.current_turn, self.road.turn_intensity)
+            enemy.draw(queue.layer("traffic"), self.road.current_turn, self.road.turn_intensity)
 
         if self.race_mode and hasattr(self, 'bot'):
-            self.bot.draw(self.screen, self.road.current_turn, self.road.turn_intensity)
+            self.bot.draw(queue.layer("bot"), self.road.current_turn, self.road.turn_intensity)
+
+        self.particles.draw(queue.layer("explosions"))
 
-        for particle in self.particles:
-            particle.draw(self.screen)
+        self.player.draw(queue.layer("player"), self.road.current_turn, self.road.turn_intensity)
+        queue.flush()
 
-        self.player.draw(self.screen, self.road.current_turn, self.road.turn_intensity)
+        if self.paletted is not None:
+            tint = INSANE_TINT if self.insane_mode else (1.0, 1.0, 1.0)
+            flash = int(100 * (self.player.drift_effect.combo_flash / 10))
+            self.paletted.present(self.screen, tint, flash)
         self.draw_hud()
 
         if self.game_over:
-            screen_width, screen_height = self.screen.get_size()
-            overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.screen.blit(overlay, (0, 0))
-
-            game_over_text = self.font_large.render("GAME OVER", True, RED)
-            name_text = self.font_medium.render(f"Driver: {self.player_name}", True, WHITE)
-            restart_text = self.font_medium.render("Press R to Restart", True, YELLOW)
-            menu_text = self.font_medium.render("Press ESC for Menu", True, YELLOW)
-
-            self.screen.blit(game_over_text, (screen_width//2 - game_over_text.get_width()//2, screen_height//2 - 120))
-            self.screen.blit(name_text, (screen_width//2 - name_text.get_width()//2, screen_height//2 - 60))
-
+            self.overlays.fill(self.screen, BLACK, 180)
             if self.race_mode:
-                if self.race_finished:
-                    result_text = self.font_medium.render("RACE FINISHED!", True, GREEN)
-                    time_text = self.font_medium.render(f"Your Time: {self.race_time}s", True, CYAN)
-                    self.screen.blit(result_text, (screen_width//2 - result_text.get_width()//2, screen_height//2 - 20))
-                    self.screen.blit(time_text, (screen_width//2 - time_text.get_width()//2, screen_height//2 + 20))
-                else:
-                    result_text = self.font_medium.render("RACE FAILED!", True, RED)
-                    self.screen.blit(result_text, (screen_width//2 - result_text.get_width()//2, screen_height//2 - 20))
+                content = ("game_over", self.player_name, True, self.race_finished, self.race_time)
             else:
-                score_text = self.font_medium.render(f"Final Score: {self.player.score}", True, WHITE)
-                drift_text = self.font_medium.render(f"Drift Score: {self.player.drift_score}", True, GREEN)
-                self.screen.blit(score_text, (screen_width//2 - score_text.get_width()//2, screen_height//2 - 20))
-                self.screen.blit(drift_text, (screen_width//2 - drift_text.get_width()//2, screen_height//2 + 20))
-
-            self.screen.blit(restart_text, (screen_width//2 - restart_text.get_width()//2, screen_height//2 + 80))
-            self.screen.blit(menu_text, (screen_width//2 - menu_text.get_width()//2, screen_height//2 + 120))
+                content = ("game_over", self.player_name, False, self.player.score, self.player.drift_score)
+            self.overlays.draw_layer(self.screen, "game_over", content, self.draw_game_over_text)
 
         if self.state == GameState.PAUSED:
-            screen_width, screen_height = self.screen.get_size()
-            overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            self.screen.blit(overlay, (0, 0))
+            self.overlays.fill(self.screen, BLACK, 150)
+            self.overlays.draw_layer(self.screen, "paused", "paused", self.draw_pause_text)
 
-            pause_text = self.font_large.render("PAUSED", True, YELLOW)
-            continue_text = self.font_medium.render("Press ENTER to Continue", True, WHITE)
-            menu_text = self.font_medium.render("Press ESC for Menu", True, WHITE)
+        self.postfx.apply(self.screen)
+        if self.show_debug:
+            self.draw_debug()
+        self.present(crt=self.postfx.is_active("crt"))
 
-            self.screen.blit(pause_text, (screen_width//2 - pause_text.get_width()//2, screen_height//2 - 60))
-            self.screen.blit(continue_text, (screen_width//2 - continue_text.get_width()//2, screen_height//2))
-            self.screen.blit(menu_text, (screen_width//2 - menu_text.get_width()//2, screen_height//2 + 40))
+    def draw_game_over_text(self, layer):
+        screen_width, screen_height = layer.get_size()
+        game_over_text = TEXT_CACHE.render(self.font_large, "GAME OVER", True, RED)
+        name_text = TEXT_CACHE.render(self.font_medium, f"Driver: {self.player_name}", True, WHITE)
+        restart_text = TEXT_CACHE.render(self.font_medium, "Press R to Restart", True, YELLOW)
+        menu_text = TEXT_CACHE.render(self.font_medium, "Press ESC for Menu", True, YELLOW)
 
-        self.crt.draw()
-        pygame.display.flip()
+        layer.blit(game_over_text, (screen_width//2 - game_over_text.get_width()//2, screen_height//2 - 120))
+        layer.blit(name_text, (screen_width//2 - name_text.get_width()//2, screen_height//2 - 60))
+
+        if self.race_mode:
+            if self.race_finished:
+                result_text = TEXT_CACHE.render(self.font_medium, "RACE FINISHED!", True, GREEN)
+                time_text = TEXT_CACHE.render(self.font_medium, f"Your Time: {self.race_time}s", True, CYAN)
+                layer.blit(result_text, (screen_width//2 - result_text.get_width()//2, screen_height//2 - 20))
+                layer.blit(time_text, (screen_width//2 - time_text.get_width()//2, screen_height//2 + 20))
+            else:
+                result_text = TEXT_CACHE.render(self.font_medium, "RACE FAILED!", True, RED)
+                layer.blit(result_text, (screen_width//2 - result_text.get_width()//2, screen_height//2 - 20))
+        else:
+            score_text = TEXT_CACHE.render(self.font_medium, f"Final Score: {self.player.score}", True, WHITE)
+            drift_text = TEXT_CACHE.render(self.font_medium, f"Drift Score: {self.player.drift_score}", True, GREEN)
+            layer.blit(score_text, (screen_width//2 - score_text.get_width()//2, screen_height//2 - 20))
+            layer.blit(drift_text, (screen_width//2 - drift_text.get_width()//2, screen_height//2 + 20))
+
+        layer.blit(restart_text, (screen_width//2 - restart_text.get_width()//2, screen_height//2 + 80))
+        layer.blit(menu_text, (screen_width//2 - menu_text.get_width()//2, screen_height//2 + 120))
+
+    def draw_pause_text(self, layer):
+        screen_width, screen_height = layer.get_size()
+        pause_text = TEXT_CACHE.render(self.font_large, "PAUSED", True, YELLOW)
+        continue_text = TEXT_CACHE.render(self.font_medium, "Press ENTER to Continue", True, WHITE)
+        menu_text = TEXT_CACHE.render(self.font_medium, "Press ESC for Menu", True, WHITE)
+
+        layer.blit(pause_text, (screen_width//2 - pause_text.get_width()//2, screen_height//2 - 60))
+        layer.blit(continue_text, (screen_width//2 - continue_text.get_width()//2, screen_height//2))
+        layer.blit(menu_text, (screen_width//2 - menu_text.get_width()//2, screen_height//2 + 40))
+
+    def draw_debug(self):
+        lines = [f"FPS: {self.clock.get_fps():.0f}"]
+        for key, name in DEBUG_KEYS.items():
+            if name not in self.postfx.enabled:
+                continue
+            if name in self.postfx.suppressed and self.postfx.enabled.get(name, True):
+                timing = "OFF (QUALITY)"
+            elif not self.postfx.is_active(name):
+                timing = "OFF"
+            else:
+                timing = f"{self.postfx.timings.get(name, 0):.1f} ms"
+            lines.append(f"{pygame.key.name(key).upper()} {name.upper()}: {timing}")
+
+        if self.screen is self.display:
+            lines.append("F8 RETRO RES: OFF")
+        else:
+            logical_width, logical_height = self.screen.get_size()
+            lines.append(f"F8 RETRO RES: {logical_width}x{logical_height} -> {self.viewport.width}x{self.viewport.height}")
+        lines.append(f"F9 8-BIT PLAYFIELD: {'ON' if self.paletted is not None else 'OFF'}")
+        if self.governor is not None:
+            lines.append(f"QUALITY: {self.quality()['name']} ({self.governor.average():.1f} ms avg)")
+        lines.append(f"TEXT CACHE: {TEXT_CACHE.hits} hits / {TEXT_CACHE.misses} misses")
+
+        screen_height = self.screen.get_height()
+        for i, line in enumerate(lines):
+            # Timings change every frame; caching them would only churn the LRU and skew its counters
+            debug_text = self.font_small.render(line, True, GREEN)
+            self.screen.blit(debug_text, (20, screen_height - 30 - (len(lines) - 1 - i) * 20))
+
+    def in_menu(self):
+        return self.state in (GameState.MENU, GameState.CAR_SELECT, GameState.NAME_INPUT,
+                              GameState.LEADERBOARD, GameState.SETTINGS)
+
+    def menu_view_key(self):
+        if self.state == GameState.MENU:
+            view = self.menu.view_key()
+        elif self.state == GameState.CAR_SELECT:
+            view = self.car_selection.view_key()
+        elif self.state == GameState.NAME_INPUT:
+            view = self.name_input.view_key(self.selected_car)
+        elif self.state == GameState.LEADERBOARD:
+            view = self.leaderboard_screen.view_key()
+        else:
+            view = self.settings_screen.view_key(self.num_lanes, self.insane_mode, self.race_mode)
+        return (self.state, view, self.display.get_size())
 
     def draw(self):
+        if not self.in_menu():
+            self.draw_playing()
+            self.presented_key = None
+            return True
+
+        # The last presented frame is still on screen, nothing to redraw
+        key = self.menu_view_key()
+        if key == self.presented_key:
+            return False
+        self.presented_key = key
+
         if self.state == GameState.MENU:
-            self.menu.draw(self.screen, self.crt)
+            self.menu.draw(self.screen)
         elif self.state == GameState.CAR_SELECT:
-            self.car_selection.draw(self.screen, self.crt)
+            self.car_selection.draw(self.screen)
         elif self.state == GameState.NAME_INPUT:
-            self.name_input.draw(self.screen, self.crt, self.selected_car)
+            self.name_input.draw(self.screen, self.selected_car)
         elif self.state == GameState.LEADERBOARD:
-            self.leaderboard_screen.draw(self.screen, self.crt)
+            self.leaderboard_screen.draw(self.screen)
         elif self.state == GameState.SETTINGS:
-            self.settings_screen.draw(self.screen, self.crt, self.num_lanes, self.insane_mode, self.race_mode)
-        elif self.state == GameState.PLAYING or self.state == GameState.PAUSED or self.state == GameState.GAME_OVER or self.state == GameState.RACE_MODE:
-            self.draw_playing()
+            self.settings_screen.draw(self.screen, self.num_lanes, self.insane_mode, self.race_mode)
+        # Menus skip the other PostFX stages but honour the CRT toggle like gameplay does
+        crt = self.postfx.is_active("crt")
+        if crt:
+            self.draw_crt(self.screen)
+        self.present(crt=crt)
+        return True
+
+    def draw_crt(self, surface):
+        # In retro mode the CRT can instead be applied at the scaled size, see present
+        if not self.crt_on_display and self.quality()["crt"] != "off":
+            self.crt.draw(surface)
+
+    def present(self, crt=True):
+        if self.screen is not self.display:
+            if self.display.get_size() != self.viewport_for:
+                self.update_viewport()
+            target = self.display.subsurface(self.viewport)
+            pygame.transform.scale(self.screen, self.viewport.size, target)
+            if crt and self.crt_on_display and self.quality()["crt"] != "off":
+                self.crt.draw(target)
+        pygame.display.flip()
 
     def run(self):
         running = True
         while running:
-            running = self.handle_events()
+            events = self.wait_for_events() if self.in_menu() else None
+            start = time.perf_counter()
+            running = self.handle_events(events)
             self.update()
-            self.draw()
+            drawn = self.draw()
+            # Only the work is measured, not the time tick() spends waiting for the next frame
+            if drawn and self.governor is not None and self.governor.record((time.perf_counter() - start) * 1000):
+                self.apply_quality()
             self.clock.tick(FPS)
 
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--export-track":
+        # Writes the built-in track in the binary format, as a starting point for custom tracks
+        sys.exit(0 if Track(DEFAULT_TRACK).save(sys.argv[2]) else 1)
     game = Game()
     game.run()
\ No newline at end of file
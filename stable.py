@@ -7,6 +7,11 @@ import json
 from datetime import datetime
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Инициализация Pygame
 pygame.init()
 pygame.mixer.init()
@@ -130,11 +135,30 @@ class CRT:
         center_x, center_y = WIDTH // 2, HEIGHT // 2
         max_radius = math.sqrt(center_x**2 + center_y**2)
 
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                dist = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-                alpha = min(150, int(200 * (dist / max_radius)))
-                vignette.set_at((x, y), (0, 0, 0, alpha))
+        if np is None:
+            # Without NumPy: concentric discs, within 2 alpha steps of the exact field
+            vignette.fill((0, 0, 0, 150))
+            for alpha in range(149, -1, -1):
+                pygame.draw.circle(vignette, (0, 0, 0, alpha), (center_x, center_y),
+                                   (alpha + 1) * max_radius / 200)
+            return vignette
+
+        # Alpha only depends on |dx| and |dy|: compute one quadrant and mirror it
+        far_x = max(center_x, WIDTH - 1 - center_x)
+        far_y = max(center_y, HEIGHT - 1 - center_y)
+        dist = np.add.outer(np.arange(far_y + 1) ** 2, np.arange(far_x + 1) ** 2).astype(np.float64)
+        np.sqrt(dist, out=dist)
+        dist /= max_radius
+        dist *= 200
+        np.minimum(dist, 150, out=dist)
+        quadrant = dist.astype(np.uint8)
+
+        alpha = pygame.surfarray.pixels_alpha(vignette).T
+        alpha[center_y:, center_x:] = quadrant[:HEIGHT - center_y, :WIDTH - center_x]
+        alpha[center_y:, :center_x] = quadrant[:HEIGHT - center_y, center_x:0:-1]
+        alpha[:center_y, center_x:] = quadrant[center_y:0:-1, :WIDTH - center_x]
+        alpha[:center_y, :center_x] = quadrant[center_y:0:-1, center_x:0:-1]
+        del alpha
         return vignette
 
     def draw(self, surface=None):